@@ -1,16 +1,30 @@
 from gnsspos.rover import Rover
 import pandas as pd
-import re
 import os
 import numpy as np
-from tqdm import tqdm
+import pyarrow.parquet as pq
 import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 
-argparser = argparse.ArgumentParser(description="GNSS Positioning Algorithm")
-# argparser.add_argument("-d", "--dataframe", action="store_true", default=False, help="Path to the working directory")
-# argparser.add_argument("-p", "--plot", action="store_true", default=False, help="Plot the results")
-# argparser.add_argument("-a", "--algorithm", action="store_true", default=False, help="Run the algorithm")
-args = argparser.parse_args()
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # numba è opzionale: se non è installato, le funzioni "compilate" girano come normale codice Python
+    NUMBA_AVAILABLE = False
+    def njit(*args, **kwargs):
+        return lambda f: f
+    prange = range
+
+try:
+    from tsdownsample import LTTBDownsampler
+except ImportError:
+    # tsdownsample è opzionale: se non è installato, il sottocampionamento dei grafici prende un punto ogni n
+    LTTBDownsampler = None
+
+logger = logging.getLogger(__name__)
 
 # Path della cartella di lavoro
 workingDirectory = os.path.join(os.path.dirname(__file__), 'examples', 'working_directory_ferrara')
@@ -22,6 +36,9 @@ rovers = [
     Rover(name="Rover3", pos_file=f"{workingDirectory}/rover_3.pos"),
 ]
 
+# indice di ciascun rover nella lista (e quindi nelle colonne degli array dell'algoritmo)
+rover_idx = {r: i for i, r in enumerate(rovers)}
+
 base = Rover(name="Base Station", pos_file=f"{workingDirectory}/base_station.pos")
 
 thesholds = {
@@ -35,287 +52,312 @@ thesholds = {
 
 # il DataFrame dei file .pos e del file .pos finale ha le seguenti colonne:
 columns = ['GPST','x-ecef(m)','y-ecef(m)','z-ecef(m)','Q','ns','sdx(m)','sdy(m)','sdz(m)','sdxy(m)','sdyz(m)','sdzx(m)','age(s)','ratio']
+# di queste, l'algoritmo usa solo le coordinate ECEF e le (co)varianze
+coord_columns = ['x-ecef(m)', 'y-ecef(m)', 'z-ecef(m)']
+sd_columns = ['sdx(m)', 'sdy(m)', 'sdz(m)', 'sdxy(m)', 'sdyz(m)', 'sdzx(m)']
+# tipo di ciascuna colonna, sia in lettura dei file .pos sia nel DataFrame finale (GPST escluso, è l'indice)
+final_dtypes = {
+    **{c: np.float64 for c in coord_columns},
+    'Q': np.int16,
+    'ns': np.int16,
+    **{c: np.float32 for c in sd_columns},
+    'age(s)': np.float32,
+    'ratio': np.float32,
+}
+
+def parse_pos(r):
+    """
+    Crea il DataFrame a partire dal file .pos di un rover e lo salva in formato parquet nella cartella di lavoro.
+    """
+    print(f"Processing {r.name}...")
+    # legge il file in un'unica passata con il parser C di pandas: le righe di commento (intestazione compresa)
+    # iniziano con '%', mentre data e orario del GPST sono due campi separati.
+    # Le colonne vengono lette direttamente nel tipo del DataFrame finale: le coordinate ECEF restano in float64,
+    # perché in float32 la risoluzione a 10^6 m è di mezzo metro
+    df = pd.read_csv(
+        r.getPosFile(),
+        sep=r'\s+',
+        comment='%',
+        header=None,
+        names=['date', 'time', *columns[1:]],
+        dtype={'date': str, 'time': str, **final_dtypes},
+        engine='c',
+    )
+    # accorpa data e orario in GPST
+    df['GPST'] = pd.to_datetime(df.pop('date') + ' ' + df.pop('time'), format='%Y/%m/%d %H:%M:%S.%f', cache=True)
+    # indicizza il DataFrame per la colonna 'GPST' (così l'accesso è più veloce)
+    df.set_index('GPST', inplace=True)
+    # aggiungi una colonna con il nome del rover
+    df['rover'] = r.name
+    # salvo il DataFrame in un file parquet (colonnare: in seguito posso leggere solo le colonne che mi servono)
+    df.to_parquet(f"{workingDirectory}/{r.name}.parquet", engine='pyarrow', compression='zstd')
 
 def create_dataframes():
     """
-    Crea i DataFrame a partire dai file .pos dei rover e salva il pickle nella cartella di lavoro.
+    Crea i DataFrame a partire dai file .pos dei rover e li salva in formato parquet nella cartella di lavoro.
+    I file dei rover sono indipendenti, per cui li elaboro in parallelo (un processo per rover).
     """
     
     print("Start processing rover data...")
-    for r in rovers:
-        print(f"Processing {r.name}...")
-        # crea un DataFrame vuoto con le colonne definite
-        df = pd.DataFrame(columns=columns)
-        # leggi il file saltando tutte le righe con commento (intestazione compresa)
-        with open(r.getPosFile(), 'r') as file:
-            while not file.readline().strip().startswith('%  GPST'):
-                next(file)
-            # legge il resto del file in un DataFrame
-            for line in tqdm(file):
-                data = re.split(r'\s+', line.strip())
-                # accorpa data e orario in GPST
-                data[0] = data[0] + ' ' + data[1]
-                data.pop(1)
-                # Aggiungi una riga al DataFrame
-                df.loc[len(df)] = data
-        # aggiusta il tipo di dato di ciascuna colonna
-        for c in columns:
-            if c == 'GPST':
-                df[c] = pd.to_datetime(df[c], format='%Y/%m/%d %H:%M:%S.%f')
-            elif c == 'Q' or c == 'ns':
-                df[c] = df[c].astype(int)
-            else:
-                df[c] = df[c].astype(float)
-        # indicizza il DataFrame per la colonna 'GPST' (così l'accesso è più veloce)
-        df.set_index('GPST', inplace=True)
-        # aggiungi una colonna con il nome del rover
-        df['rover'] = r.name
-        # salvo il DataFrame in un pickle
-        df.to_pickle(f"{workingDirectory}/{r.name}.pkl")
-
-# se nella working directory non ci sono i file .pkl o se lo richiedo esplicitamente, li creo
-if (not all([f"{r.name}.pkl" in os.listdir(workingDirectory) for r in rovers])):
-    print("(Re)creating dataframes...")
-    create_dataframes()
-
-################## fine creazione DataFrame ##################
-
-# mi aspetto che le epoche non siano tutte uguali, quindi scorro una prima volta tutti i DataFrame per capire lo starting time e l'ending time. 
-# Approfitto del momento per salvare in un array tutti i DataFrame
-dataframes = []
-min_gpst = 0
-max_gpst = 0
-
-for r in rovers:
-    # carica il DataFrame dal pickle
-    df = pd.read_pickle(f"{workingDirectory}/{r.name}.pkl")
-    # calcola il GPST minimo e massimo
-    if min_gpst == 0:
-        min_gpst = df.index.min()
-    if max_gpst == 0:
-        max_gpst = df.index.max()
-    # aggiorna il GPST minimo e massimo
-    min_gpst = min(min_gpst, df.index.min())
-    max_gpst = max(max_gpst, df.index.max())
-    # aggiungi il DataFrame alla lista
-    dataframes.append(df)
-    print(f"Finished processing {r.name} ({min_gpst} - {max_gpst})")        
-
-# stampa min_gpst e max_gpst
-print("Min and Max GPST across all rovers:")
-print(f"- min_gpst: {min_gpst}")
-print(f"- max_gpst: {max_gpst}")
-print()
+    with ProcessPoolExecutor(max_workers=len(rovers)) as executor:
+        list(executor.map(parse_pos, rovers))
 
-def algorithm():
-    for kDf, df in enumerate(dataframes):
-        # filtra il DataFrame in base a min_gpst e max_gpst
-        df = df[(df.index >= min_gpst) & (df.index <= max_gpst)]
-        # stampa il DataFrame
-        print(df)
+def gpst_bounds(path):
+    """
+    Restituisce il GPST minimo e massimo di un file parquet usando solo le statistiche dei row group, senza leggerne le righe.
+    """
+    metadata = pq.read_metadata(path)
+    k = metadata.schema.names.index('GPST')
+    stats = [metadata.row_group(i).column(k).statistics for i in range(metadata.num_row_groups)]
+    return pd.Timestamp(min(s.min for s in stats)), pd.Timestamp(max(s.max for s in stats))
 
-    # in questo momento ho i DataFrame di ciascun rover, tutti che partono dallo stesso (min)GPST e terminano allo stesso (max)GPST
-    # posso applicare l'algoritmo per la creazione di un file .pos finale
-    # creo un DataFrame finale vuoto
-    final_df = pd.DataFrame(columns=columns)
+def align(df, epochs, cols):
+    """
+    Allinea per posizione le colonne cols del DataFrame sulle epoche date: restituisce un array (T, len(cols)), NaN dove l'epoca manca.
+    """
+    values = df[cols].to_numpy(dtype=float)
+    # posizione (intera) di ciascuna epoca nell'indice del DataFrame, -1 se l'epoca manca: una sola ricerca nella hashtable dell'indice
+    pos = df.index.get_indexer(epochs)
+    found = pos >= 0
+    out = np.full((len(epochs), len(cols)), np.nan)
+    out[found] = values[pos[found]]
+    return out
 
-    # 1) per ogni epoca, faccio un primo check sui rover disponibili. In particolare, mi interessa che:
-    # - vi sia l'epoca
-    # - la distanza con gli altri rover non sia "eccessivamente" sbagliata
-    # nel caso in cui uno dei due elementi non è rispettato, rimuovo l'epoca
-    current_gpst = min_gpst
-    while current_gpst < max_gpst:
-        print(current_gpst)
-        
-        # metto i ricevitori non validi in un set
-        invalid_rovers = set()
+@dataclass
+class RoverBundle:
+    """
+    Dati di tutti i rover allineati sulle stesse epoche: un array (T, R) contiguo per ciascuna grandezza, NaN dove l'epoca manca.
+    Le coordinate ECEF restano in float64 (in float32 la risoluzione a 10^6 m è di mezzo metro), le (co)varianze sono in float32.
+    """
+    
+    x: np.ndarray
+    """x-ecef(m) di ciascun rover."""
+    
+    y: np.ndarray
+    """y-ecef(m) di ciascun rover."""
+    
+    z: np.ndarray
+    """z-ecef(m) di ciascun rover."""
+    
+    sdx: np.ndarray
+    """sdx(m) di ciascun rover."""
+    
+    sdy: np.ndarray
+    """sdy(m) di ciascun rover."""
+    
+    sdz: np.ndarray
+    """sdz(m) di ciascun rover."""
+    
+    sdxy: np.ndarray
+    """sdxy(m) di ciascun rover."""
+    
+    sdyz: np.ndarray
+    """sdyz(m) di ciascun rover."""
+    
+    sdzx: np.ndarray
+    """sdzx(m) di ciascun rover."""
+    
+    @classmethod
+    def from_dataframes(cls, dataframes, epochs):
+        """Allinea i DataFrame dei rover sulle epoche date."""
+        data = np.stack([align(df, epochs, coord_columns + sd_columns) for df in dataframes], axis=1)
+        coords = [np.ascontiguousarray(data[..., k]) for k in range(len(coord_columns))]
+        sds = [np.ascontiguousarray(data[..., len(coord_columns) + k], dtype=np.float32) for k in range(len(sd_columns))]
+        return cls(*coords, *sds)
+    
+    def coords(self):
+        """Restituisce le coordinate ECEF (x, y, z)."""
+        return (self.x, self.y, self.z)
+    
+    def sds(self):
+        """Restituisce le (co)varianze (sdx, sdy, sdz, sdxy, sdyz, sdzx)."""
+        return (self.sdx, self.sdy, self.sdz, self.sdxy, self.sdyz, self.sdzx)
+
+@njit(cache=True)
+def correct(coords, sds, invalid_mask):
+    """
+    Corregge (sul posto) le epoche dei rover non validi, scorrendo le epoche in avanti:
+    - alla prima epoca, se c'è un solo rover non valido, prendo la media dei rover validi (e il valore più alto delle (co)varianze)
+    - alle epoche successive, interpolo linearmente tra l'ultima epoca disponibile (eventualmente già corretta) e la prima epoca successiva
+    Gli array (T, R) in coords e sds possono avere più epoche di invalid_mask (T', R): le epoche in più servono solo come epoche successive.
+    """
+    x = coords[0]
+    T, R = invalid_mask.shape
+    
+    # per ogni rover, indice della prima epoca successiva in cui il dato (originale) è presente (-1 se non c'è)
+    next_idx = np.full((x.shape[0], R), -1, np.int64)
+    for r in range(R):
+        n = -1
+        for t in range(x.shape[0] - 1, -1, -1):
+            next_idx[t, r] = n
+            if not np.isnan(x[t, r]):
+                n = t
+    
+    # per ogni rover, indice dell'ultima epoca disponibile (-1 se non c'è)
+    last_valid = np.full(R, -1, np.int64)
+    
+    for t in range(T):
+        n_invalid = 0
+        for r in range(R):
+            if invalid_mask[t, r]:
+                n_invalid += 1
         
-        for kI, vI in enumerate(rovers):
-            # controlla se l'epoca è presente nel DataFrame
-            if current_gpst not in dataframes[kI].index:
-                # se non è presente, metti il rover in invalid_rovers
-                invalid_rovers.add(vI)
-                print(f"{' '*20}- {vI.name} not available")
-            else:
-                for kJ, vJ in enumerate(rovers):
-                    # il confronto deve essere con gli altri rover
-                    if kI < kJ:
-                        if current_gpst not in dataframes[kJ].index:
-                            # se non è presente l'epoca che mi interessa, metti il rover in invalid_rovers
-                            invalid_rovers.add(vJ)
-                            print(f"{' '*20}- {vJ.name} not available")
-                        else:
-                            # calcola la distanza tra i rover
-                            xI = dataframes[kI].loc[current_gpst]['x-ecef(m)']
-                            yI = dataframes[kI].loc[current_gpst]['y-ecef(m)']
-                            zI = dataframes[kI].loc[current_gpst]['z-ecef(m)']
-                            xJ = dataframes[kJ].loc[current_gpst]['x-ecef(m)']
-                            yJ = dataframes[kJ].loc[current_gpst]['y-ecef(m)']
-                            zJ = dataframes[kJ].loc[current_gpst]['z-ecef(m)']
-                            dist = np.sqrt((xI - xJ) ** 2 + (yI - yJ) ** 2 + (zI - zJ) ** 2)
-                            # se la distanza è maggiore della soglia, rimuovi l'epoca
-                            if dist > thesholds[(vI, vJ)]:
-                                print(f"{' '*20}- {vI.name}-{vJ.name} = {dist} > {thesholds[(vI, vJ)]} KO!")
-                                # sia il rover I che il rover J non sono validi
-                                invalid_rovers.add(vI)
-                                invalid_rovers.add(vJ)
-                            else:
-                                print(f"{' '*20}- {vI.name}-{vJ.name} = {dist} <= {thesholds[(vI, vJ)]} OK!")
-
-        # 2) se ci sono rover non validi, correggo usando l'elemento precedente e successivo della serie temporale:
-        # - per le grandezze, faccio la media
-        # - per le (co)varianze, prendo il valore più alto
-        if len(invalid_rovers) > 0:
-            print(f"\n{' '*20}Invalid rovers: {' '.join([r.name for r in invalid_rovers])}\n")
-            # rimuovi i rover non validi
-            for r in invalid_rovers:
+        for r in range(R):
+            if invalid_mask[t, r]:
                 # TODO:
                 # di sicuro la prima epoca di ciascun rover non è mai vuota, ma può comunque essere sbagliata...
                 # se è la prima non posso fare interpolazione lineare con il valore dell'epoca precedente e dell'epoca successiva, per cui:
                 # - la lascio invariata
                 # - [scelta corrente] faccio interpolazione pesata con gli altri rover (ammesso che ci siano e siano validi)
                 # - la copio da un altro rover... anche se all'inizio può capitare che tutti i rover siano sbagliati...
-                if current_gpst == min_gpst and len(invalid_rovers) == 1: 
-                    new_row = {}
-                    # se c'è solo un rover non valido, prendo i dati da tutti gli altri rover. In particolare:
-                    # - GPST: ce l'ho già
-                    new_row['GPST'] = current_gpst
-                    # - x-ecef(m), y-ecef(m), z-ecef(m): media tra i rover validi
-                    new_row['x-ecef(m)'] = 0
-                    new_row['y-ecef(m)'] = 0
-                    new_row['z-ecef(m)'] = 0
-                    # - sdx(m), sdy(m), sdz(m), sdxy(m), sdyz(m), sdzx(m): prendo il valore più alto
-                    new_row['sdx(m)'] = 0
-                    new_row['sdy(m)'] = 0
-                    new_row['sdz(m)'] = 0
-                    new_row['sdxy(m)'] = 0
-                    new_row['sdyz(m)'] = 0
-                    new_row['sdzx(m)'] = 0
-                    new_row['Q'] = 0 
-                    new_row['ns'] = 0 
-                    new_row['age(s)'] = 0 
-                    new_row['ratio'] = 0 
-                    for kDf, df in enumerate(dataframes):
-                        # se il rover è valido, prendo i dati
-                        if rovers[kDf] not in invalid_rovers:
-                            # inizialmente sommo x/y/z-ecef(m) (per poi fare la media)
-                            new_row['x-ecef(m)'] += df.loc[current_gpst]['x-ecef(m)']
-                            new_row['y-ecef(m)'] += df.loc[current_gpst]['y-ecef(m)']
-                            new_row['z-ecef(m)'] += df.loc[current_gpst]['z-ecef(m)']
-                            # prendo il valore più alto delle (co)varianze
-                            new_row['sdx(m)'] = max(new_row['sdx(m)'], df.loc[current_gpst]['sdx(m)'])
-                            new_row['sdy(m)'] = max(new_row['sdy(m)'], df.loc[current_gpst]['sdy(m)'])
-                            new_row['sdz(m)'] = max(new_row['sdz(m)'], df.loc[current_gpst]['sdz(m)'])
-                            new_row['sdxy(m)'] = max(new_row['sdxy(m)'], df.loc[current_gpst]['sdxy(m)'])
-                            new_row['sdyz(m)'] = max(new_row['sdyz(m)'], df.loc[current_gpst]['sdyz(m)'])
-                            new_row['sdzx(m)'] = max(new_row['sdzx(m)'], df.loc[current_gpst]['sdzx(m)'])
-                            # Q, ns, age(s) e ratio: non mi interessano (li lascio invariati)
-                            new_row['Q'] = min(new_row['Q'], df.loc[current_gpst]['Q'])
-                            new_row['ns'] = max(new_row['ns'], df.loc[current_gpst]['ns'])
-                            new_row['age(s)'] = max(new_row['age(s)'], df.loc[current_gpst]['age(s)'])
-                            new_row['ratio'] = max(new_row['ratio'], df.loc[current_gpst]['ratio'])
-                    # faccio la media
-                    new_row['x-ecef(m)'] /= len(rovers) - len(invalid_rovers)
-                    new_row['y-ecef(m)'] /= len(rovers) - len(invalid_rovers)
-                    new_row['z-ecef(m)'] /= len(rovers) - len(invalid_rovers)
-                                    
-                    # aggiorno la riga al DataFrame
-                    df = dataframes[rovers.index(r)]
-                    df.loc[current_gpst] = new_row
-                    # aggiorno il DataFrame
-                    dataframes[rovers.index(r)] = df
-                elif current_gpst > min_gpst:
-                    # interpolazione lineare con la prima epoca precedente e la prima epoca successiva
-                    df = dataframes[rovers.index(r)]
-                    # prendo la prima epoca precedente
-                    prev_gpst = df.index[df.index < current_gpst].max()
-                    # prendo la prima epoca successiva
-                    next_gpst = df.index[df.index > current_gpst].min()
-                    # prendo i dati della prima epoca precedente
-                    prev_row = df.loc[prev_gpst]
-                    # prendo i dati della prima epoca successiva
-                    next_row = df.loc[next_gpst]
-                    
-                    new_row = {}
-                    # GPST: ce l'ho già
-                    new_row['GPST'] = current_gpst
-                    # x-ecef(m), y-ecef(m), z-ecef(m): media tra epoca precedente e successiva
-                    new_row['x-ecef(m)'] = (prev_row['x-ecef(m)'] + next_row['x-ecef(m)']) / 2
-                    new_row['y-ecef(m)'] = (prev_row['y-ecef(m)'] + next_row['y-ecef(m)']) / 2
-                    new_row['z-ecef(m)'] = (prev_row['z-ecef(m)'] + next_row['z-ecef(m)']) / 2
-                    # Q e ns: non mi interessa...
-                    new_row['Q'] = min(prev_row['Q'], next_row['Q'])
-                    new_row['ns'] = max(prev_row['ns'], next_row['ns'])                
+                if t == 0 and n_invalid == 1 and R > 1:
+                    # x-ecef(m), y-ecef(m), z-ecef(m): media tra i rover validi
+                    for a in coords:
+                        a[t, r] = 0.0
+                        for k in range(R):
+                            if not invalid_mask[t, k]:
+                                a[t, r] += a[t, k]
+                        a[t, r] /= R - n_invalid
                     # sdx(m), sdy(m), sdz(m), sdxy(m), sdyz(m), sdzx(m): prendo il valore più alto
-                    new_row['sdx(m)'] = max(prev_row['sdx(m)'], next_row['sdx(m)'])
-                    new_row['sdy(m)'] = max(prev_row['sdy(m)'], next_row['sdy(m)'])
-                    new_row['sdz(m)'] = max(prev_row['sdz(m)'], next_row['sdz(m)'])
-                    new_row['sdxy(m)'] = max(prev_row['sdxy(m)'], next_row['sdxy(m)'])
-                    new_row['sdyz(m)'] = max(prev_row['sdyz(m)'], next_row['sdyz(m)'])
-                    new_row['sdzx(m)'] = max(prev_row['sdzx(m)'], next_row['sdzx(m)'])
-                    # age(s) e ratio: non mi interessa...
-                    new_row['age(s)'] = max(prev_row['age(s)'], next_row['age(s)'])
-                    new_row['ratio'] = max(prev_row['ratio'], next_row['ratio'])
-                    
-                    # aggiorno la riga al DataFrame
-                    df.loc[current_gpst] = new_row
-                    
-                    # aggiorno il DataFrame
-                    dataframes[rovers.index(r)] = df
-        
-        # prima di passare all'epoca successiva, aggiorno il DataFrame finale
-        # 3) interpolazione pesata con l'inverso delle varianze
-        # - GPST: ce l'ho già
-        # - x-ecef(m), y-ecef(m), z-ecef(m): media pesata tra i rover validi. In particolare: sommatoria di (x_i / sdi^2) / sommatoria di (1 / sdi^2)
-        new_row = {}
-        new_row['GPST'] = current_gpst
-        new_row['x-ecef(m)'] = 0
-        new_row['y-ecef(m)'] = 0
-        new_row['z-ecef(m)'] = 0
-        # somma dei pesi
-        weights = {
-            'x-ecef(m)': 0,
-            'y-ecef(m)': 0,
-            'z-ecef(m)': 0,
-        }
-        for kDf, df in enumerate(dataframes):
-            new_row['x-ecef(m)'] += df.loc[current_gpst]['x-ecef(m)'] * (df.loc[current_gpst]['sdx(m)'] ** -2)
-            new_row['y-ecef(m)'] += df.loc[current_gpst]['y-ecef(m)'] * (df.loc[current_gpst]['sdy(m)'] ** -2)
-            new_row['z-ecef(m)'] += df.loc[current_gpst]['z-ecef(m)'] * (df.loc[current_gpst]['sdz(m)'] ** -2)
-            weights['x-ecef(m)'] += (df.loc[current_gpst]['sdx(m)'] ** -2)
-            weights['y-ecef(m)'] += (df.loc[current_gpst]['sdy(m)'] ** -2)
-            weights['z-ecef(m)'] += (df.loc[current_gpst]['sdz(m)'] ** -2)
-        # faccio la media pesata
-        new_row['x-ecef(m)'] /= weights['x-ecef(m)']
-        new_row['y-ecef(m)'] /= weights['y-ecef(m)']
-        new_row['z-ecef(m)'] /= weights['z-ecef(m)']
-        # - Q e ns: non mi interessa...
-        new_row['Q'] = 0
-        new_row['ns'] = 0
-        # - sdx(m), sdy(m), sdz(m): prendo il valore più alto
-        new_row['sdx(m)'] = 0
-        new_row['sdy(m)'] = 0
-        new_row['sdz(m)'] = 0
-        # - sdxy(m), sdyz(m), sdzx(m): prendo il valore più alto
-        new_row['sdxy(m)'] = 0
-        new_row['sdyz(m)'] = 0
-        new_row['sdzx(m)'] = 0
-        for kDf, df in enumerate(dataframes):
-            new_row['sdx(m)'] = max(new_row['sdx(m)'], df.loc[current_gpst]['sdx(m)'])
-            new_row['sdy(m)'] = max(new_row['sdy(m)'], df.loc[current_gpst]['sdy(m)'])
-            new_row['sdz(m)'] = max(new_row['sdz(m)'], df.loc[current_gpst]['sdz(m)'])
-            new_row['sdxy(m)'] = max(new_row['sdxy(m)'], df.loc[current_gpst]['sdxy(m)'])
-            new_row['sdyz(m)'] = max(new_row['sdyz(m)'], df.loc[current_gpst]['sdyz(m)'])
-            new_row['sdzx(m)'] = max(new_row['sdzx(m)'], df.loc[current_gpst]['sdzx(m)'])
-        # - age(s) e ratio: non mi interessa...
-        new_row['age(s)'] = 0
-        new_row['ratio'] = 0
-        
-        # aggiungo la riga al DataFrame finale
-        final_df.loc[current_gpst] = new_row
-        
-        # passo all'epoca successiva
-        current_gpst += pd.Timedelta(seconds=1)
+                    for a in sds:
+                        a[t, r] = 0.0
+                        for k in range(R):
+                            if not invalid_mask[t, k]:
+                                a[t, r] = max(a[t, r], a[t, k])
+                elif t > 0:
+                    # interpolazione lineare con la prima epoca precedente e la prima epoca successiva
+                    # (se una delle due manca, uso solo l'altra)
+                    prev_t = last_valid[r]
+                    next_t = next_idx[t, r]
+                    if prev_t < 0:
+                        prev_t = next_t
+                    if next_t < 0:
+                        next_t = prev_t
+                    if prev_t >= 0:
+                        # x-ecef(m), y-ecef(m), z-ecef(m): media tra epoca precedente e successiva
+                        for a in coords:
+                            a[t, r] = (a[prev_t, r] + a[next_t, r]) / 2
+                        # sdx(m), sdy(m), sdz(m), sdxy(m), sdyz(m), sdzx(m): prendo il valore più alto
+                        for a in sds:
+                            a[t, r] = max(a[prev_t, r], a[next_t, r])
+            
+            # aggiorno l'ultima epoca disponibile del rover
+            if not np.isnan(x[t, r]):
+                last_valid[r] = t
+
+@njit(parallel=True, cache=True, error_model='numpy')
+def fuse(coords, sds, out_coords, out_sds):
+    """
+    Fonde i rover epoca per epoca, in parallelo sulle epoche (ciascuna epoca è indipendente dalle altre):
+    - x-ecef(m), y-ecef(m), z-ecef(m): media pesata con l'inverso delle varianze sdx(m), sdy(m), sdz(m)
+    - sdx(m), sdy(m), sdz(m), sdxy(m), sdyz(m), sdzx(m): prendo il valore più alto
+    Come np.nansum/np.nanmax, i valori NaN vengono ignorati. Gli array (T, R) in coords e sds possono avere più epoche degli array di output.
+    """
+    T = out_coords[0].shape[0]
+    R = coords[0].shape[1]
+    for t in prange(T):
+        for c in range(len(out_coords)):
+            a = coords[c]
+            sd = sds[c]
+            # i pesi sono in float32, le somme in float64
+            num = 0.0
+            den = 0.0
+            for r in range(R):
+                w = np.float32(1.0) / (sd[t, r] * sd[t, r])
+                if not np.isnan(w):
+                    den += w
+                    if not np.isnan(a[t, r]):
+                        num += a[t, r] * w
+            out_coords[c][t] = num / den
+        for c in range(len(out_sds)):
+            sd = sds[c]
+            m = 0.0
+            for r in range(R):
+                if sd[t, r] > m:
+                    m = sd[t, r]
+            out_sds[c][t] = m
+
+def algorithm():
+    # epoche su cui lavora l'algoritmo: da min_gpst a max_gpst (escluso), con passo di 1 secondo.
+    # I dati vengono allineati anche su max_gpst, che fa da epoca successiva per correggere l'ultima
+    grid = pd.date_range(min_gpst, max_gpst, freq='1s')
+    epochs = grid[grid < max_gpst]
+    T = len(epochs)
+    
+    # allineo i dati di tutti i rover sulle stesse epoche: un array (T, R) per ciascuna grandezza, NaN dove l'epoca manca
+    bundle = RoverBundle.from_dataframes(dataframes, grid)
+    
+    # 1) per ogni epoca, faccio un primo check sui rover disponibili. In particolare, mi interessa che:
+    # - vi sia l'epoca
+    # - la distanza con gli altri rover non sia "eccessivamente" sbagliata
+    # nel caso in cui uno dei due elementi non è rispettato, rimuovo l'epoca
+    # distanze tra tutte le coppie di rover, per tutte le epoche in un colpo solo: array (T, R, R)
+    # (le coordinate sono array separati, per cui accumulo i quadrati delle differenze sul posto, senza altri array temporanei)
+    dist = np.zeros((T, len(rovers), len(rovers)))
+    diff = np.empty_like(dist)
+    for a in bundle.coords():
+        np.subtract(a[:T, :, None], a[:T, None, :], out=diff)
+        np.square(diff, out=diff)
+        dist += diff
+    np.sqrt(dist, out=dist)
+    
+    # matrice (simmetrica) delle soglie tra i rover; le coppie senza soglia non vengono controllate
+    thresh_mat = np.full((len(rovers), len(rovers)), np.inf)
+    for (vI, vJ), value in thesholds.items():
+        if isinstance(vI, Rover) and isinstance(vJ, Rover):
+            kI, kJ = rover_idx[vI], rover_idx[vJ]
+            thresh_mat[kI, kJ] = thresh_mat[kJ, kI] = value
+    
+    # se manca uno dei due rover la distanza è NaN e il confronto con la soglia è sempre falso
+    too_far_mask = dist > thresh_mat
+    nan_mask = np.isnan(bundle.x[:T])
+    invalid_mask = nan_mask | too_far_mask.any(axis=-1)
+    
+    # dettaglio di tutte le epoche e di tutte le coppie di rover (solo con --verbose)
+    if logger.isEnabledFor(logging.DEBUG):
+        pairs = list(zip(*np.triu_indices(len(rovers), k=1)))
+        for t, current_gpst in enumerate(epochs):
+            logger.debug("%s", current_gpst)
+            for k in np.flatnonzero(nan_mask[t]):
+                logger.debug("%s- %s not available", ' '*20, rovers[k].name)
+            for kI, kJ in pairs:
+                if nan_mask[t, kI] or nan_mask[t, kJ]:
+                    continue
+                if too_far_mask[t, kI, kJ]:
+                    logger.debug("%s- %s-%s = %s > %s KO!", ' '*20, rovers[kI].name, rovers[kJ].name, dist[t, kI, kJ], thresh_mat[kI, kJ])
+                else:
+                    logger.debug("%s- %s-%s = %s <= %s OK!", ' '*20, rovers[kI].name, rovers[kJ].name, dist[t, kI, kJ], thresh_mat[kI, kJ])
+            if invalid_mask[t].any():
+                logger.debug("\n%sInvalid rovers: %s\n", ' '*20, ' '.join([rovers[k].name for k in np.flatnonzero(invalid_mask[t])]))
+
+    # 2) se ci sono rover non validi, correggo usando l'elemento precedente e successivo della series temporale:
+    # - per le grandezze, faccio la media
+    # - per le (co)varianze, prendo il valore più alto
+    correct(bundle.coords(), bundle.sds(), invalid_mask)
+    
+    # in questo momento ho i dati di ciascun rover, tutti che partono dallo stesso (min)GPST e terminano allo stesso (max)GPST
+    # posso applicare l'algoritmo per la creazione di un file .pos finale
+    # preparo un array per ciascuna colonna del DataFrame finale, già del tipo giusto
+    final = {c: np.zeros(T, dtype=final_dtypes[c]) for c in columns[1:]}
+    
+    # 3) interpolazione pesata con l'inverso delle varianze, su tutte le epoche in un colpo solo
+    # - GPST: ce l'ho già (sono le epoche)
+    # - x-ecef(m), y-ecef(m), z-ecef(m): media pesata tra i rover. In particolare: sommatoria di (x_i / sdi^2) / sommatoria di (1 / sdi^2)
+    # - sdx(m), sdy(m), sdz(m), sdxy(m), sdyz(m), sdzx(m): prendo il valore più alto
+    if NUMBA_AVAILABLE:
+        fuse(bundle.coords(), bundle.sds(), tuple(final[c] for c in coord_columns), tuple(final[c] for c in sd_columns))
+    else:
+        # senza numba, uso direttamente NumPy
+        for col, a, sd in zip(coord_columns, bundle.coords(), bundle.sds()):
+            # i pesi sono in float32, ma le somme vanno fatte in float64: l'errore relativo sulla somma dei pesi si riporterebbe sulla coordinata intera
+            w = np.reciprocal(sd[:T] * sd[:T], dtype=np.float32)
+            np.divide(np.nansum(a[:T] * w, axis=1), np.nansum(w, axis=1, dtype=np.float64), out=final[col])
+        for col, sd in zip(sd_columns, bundle.sds()):
+            np.nanmax(sd[:T], axis=1, initial=0, out=final[col])
+    # - Q, ns, age(s) e ratio: non mi interessa... (restano a 0)
+    
+    # creo il DataFrame finale in un colpo solo, indicizzato per GPST
+    final_df = pd.DataFrame(final, index=epochs.rename('GPST'))
         
     # salvo il DataFrame finale in un pickle
     final_df.to_pickle(f"{workingDirectory}/final_df.pkl")
@@ -326,42 +368,114 @@ def algorithm():
     print("Final DataFrame:")
     print(final_df)
 
-# algorithm()
+def downsample(series, n_out=2000):
+    """
+    Riduce una series a circa n_out punti per il grafico (più di quanti ne mostri lo schermo non serve disegnarne).
+    Con tsdownsample usa LTTB, che conserva la forma della curva; altrimenti prende un punto ogni n.
+    """
+    if len(series) <= n_out:
+        return series
+    if LTTBDownsampler is not None:
+        idx = LTTBDownsampler().downsample(series.to_numpy(), n_out=n_out)
+    else:
+        idx = np.arange(0, len(series), -(-len(series) // n_out))
+    return series.iloc[idx]
+
+# i processi di create_dataframes possono importare questo modulo: lo script vero e proprio gira solo se lanciato direttamente
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser(description="GNSS Positioning Algorithm")
+    # argparser.add_argument("-d", "--dataframe", action="store_true", default=False, help="Path to the working directory")
+    # argparser.add_argument("-p", "--plot", action="store_true", default=False, help="Plot the results")
+    # argparser.add_argument("-a", "--algorithm", action="store_true", default=False, help="Run the algorithm")
+    argparser.add_argument("-v", "--verbose", action="store_true", default=False, help="Print the details of the invalid rovers at each epoch")
+    args = argparser.parse_args()
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG if args.verbose else logging.WARNING)
+
+    # se nella working directory non ci sono i file .parquet o se lo richiedo esplicitamente, li creo
+    if (not all([f"{r.name}.parquet" in os.listdir(workingDirectory) for r in rovers])):
+        print("(Re)creating dataframes...")
+        create_dataframes()
+
+    ################## fine creazione DataFrame ##################
+
+    # se il DataFrame finale c'è già non rieseguo l'algoritmo: dei rover mi servono solo le coordinate da disegnare
+    final_exists = os.path.exists(f"{workingDirectory}/final_df.pkl")
+
+    # mi aspetto che le epoche non siano tutte uguali, quindi scorro una prima volta tutti i DataFrame per capire lo starting time e l'ending time. 
+    # Approfitto del momento per salvare in un array tutti i DataFrame
+    dataframes = []
+    min_gpst = 0
+    max_gpst = 0
+
+    for r in rovers:
+        # calcola il GPST minimo e massimo dai metadati del file parquet
+        rover_min_gpst, rover_max_gpst = gpst_bounds(f"{workingDirectory}/{r.name}.parquet")
+        if min_gpst == 0:
+            min_gpst = rover_min_gpst
+        if max_gpst == 0:
+            max_gpst = rover_max_gpst
+        # aggiorna il GPST minimo e massimo
+        min_gpst = min(min_gpst, rover_min_gpst)
+        max_gpst = max(max_gpst, rover_max_gpst)
+        # carica dal file parquet solo le colonne che servono e aggiungi il DataFrame alla lista
+        df = pd.read_parquet(f"{workingDirectory}/{r.name}.parquet", columns=coord_columns if final_exists else coord_columns + sd_columns)
+        dataframes.append(df)
+        print(f"Finished processing {r.name} ({min_gpst} - {max_gpst})")        
+
+    # stampa min_gpst e max_gpst
+    print("Min and Max GPST across all rovers:")
+    print(f"- min_gpst: {min_gpst}")
+    print(f"- max_gpst: {max_gpst}")
+    print()
+
+    if not final_exists:
+        algorithm()
     
-# read from pickle
-print("Reading final DataFrame from pickle...")
-final_df = pd.read_pickle(f"{workingDirectory}/final_df.pkl")
-
-import matplotlib.pyplot as plt
-
-# Plot each DataFrame's x-ecef(m), y-ecef(m), and z-ecef(m) on separate line graphs (stacked vertically)
-fig, axes = plt.subplots(3, 1, figsize=(12, 12), sharex=True)
-
-# Plot x-ecef(m)
-for kDf, df in enumerate(dataframes):
-    axes[0].plot(df.index, df['x-ecef(m)'], label=f"{rovers[kDf].name}")
-axes[0].plot(final_df.index, final_df['x-ecef(m)'], label="Final", linestyle='--', color='red')
-axes[0].set_ylabel("x-ecef(m)")
-axes[0].set_title("ECEF Coordinates Over Time")
-axes[0].legend()
-axes[0].grid()
-
-# Plot y-ecef(m)
-for kDf, df in enumerate(dataframes):
-    axes[1].plot(df.index, df['y-ecef(m)'], label=f"{rovers[kDf].name}")
-axes[1].plot(final_df.index, final_df['y-ecef(m)'], label="Final", linestyle='--', color='red')
-axes[1].set_ylabel("y-ecef(m)")
-axes[1].legend()
-axes[1].grid()
-
-# Plot z-ecef(m)
-for kDf, df in enumerate(dataframes):
-    axes[2].plot(df.index, df['z-ecef(m)'], label=f"{rovers[kDf].name}")
-axes[2].plot(final_df.index, final_df['z-ecef(m)'], label="Final", linestyle='--', color='red')
-axes[2].set_xlabel("GPST")
-axes[2].set_ylabel("z-ecef(m)")
-axes[2].legend()
-axes[2].grid()
-
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+    # read from pickle
+    print("Reading final DataFrame from pickle...")
+    final_df = pd.read_pickle(f"{workingDirectory}/final_df.pkl")
+
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+
+    # l'Agg backend spezza i tracciati lunghi in blocchi, invece di renderizzarli in un colpo solo
+    mpl.rcParams['agg.path.chunksize'] = 10000
+
+    # Plot each DataFrame's x-ecef(m), y-ecef(m), and z-ecef(m) on separate line graphs (stacked vertically)
+    fig, axes = plt.subplots(3, 1, figsize=(12, 12), sharex=True)
+
+    # Plot x-ecef(m)
+    for kDf, df in enumerate(dataframes):
+        series = downsample(df['x-ecef(m)'])
+        axes[0].plot(series.index, series, label=f"{rovers[kDf].name}")
+    series = downsample(final_df['x-ecef(m)'])
+    axes[0].plot(series.index, series, label="Final", linestyle='--', color='red')
+    axes[0].set_ylabel("x-ecef(m)")
+    axes[0].set_title("ECEF Coordinates Over Time")
+    axes[0].legend()
+    axes[0].grid()
+
+    # Plot y-ecef(m)
+    for kDf, df in enumerate(dataframes):
+        series = downsample(df['y-ecef(m)'])
+        axes[1].plot(series.index, series, label=f"{rovers[kDf].name}")
+    series = downsample(final_df['y-ecef(m)'])
+    axes[1].plot(series.index, series, label="Final", linestyle='--', color='red')
+    axes[1].set_ylabel("y-ecef(m)")
+    axes[1].legend()
+    axes[1].grid()
+
+    # Plot z-ecef(m)
+    for kDf, df in enumerate(dataframes):
+        series = downsample(df['z-ecef(m)'])
+        axes[2].plot(series.index, series, label=f"{rovers[kDf].name}")
+    series = downsample(final_df['z-ecef(m)'])
+    axes[2].plot(series.index, series, label="Final", linestyle='--', color='red')
+    axes[2].set_xlabel("GPST")
+    axes[2].set_ylabel("z-ecef(m)")
+    axes[2].legend()
+    axes[2].grid()
+
+    plt.tight_layout()
+    plt.show()
\ No newline at end of file
@@ -217,7 +217,7 @@ class GNSSPos:
         # Implementation of the algorithm...
         # TODO: place code here
         
-        logFunction.info("Processing completed successfully.")
+        logFunction("Processing completed successfully.")
          
         
     def setUi(self, ui: UserInterface):
@@ -1,11 +1,50 @@
 from datetime import datetime
-import math
+import functools
+import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
 import os
-import gzip
-import unlzw3
+try:
+    # isal (Intel ISA-L) is a drop-in replacement for gzip with much faster decompression
+    from isal import igzip as gzip
+except ImportError:
+    import gzip
+import ncompress
 import shutil
-from pathlib import Path
+import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+READ_BUFFER_SIZE = 1 << 20
+"""Buffer size (1 MiB) used when downloading and extracting files."""
+
+_GZ_CUTOFF = datetime(2020, 12, 1)
+"""Daily files created before this date are Unix compressed (.Z) instead of gzipped."""
+
+_DATE_FIELDS = ('date_str', 'date_obj', 'YYYY', 'YY', 'DDD', 'D', 'D_us', 'WWWW')
+"""Names of the fields of the date object, in the order returned by _build_date_fields."""
+
+@functools.lru_cache(maxsize=4096)
+def _build_date_fields(year: int, month: int, day: int) -> tuple:
+    """Compute the fields of the date object (see _DATE_FIELDS) for the given date. The result is cached, as the same dates are set over and over."""
+    date_obj = datetime(year, month, day)
+    # assemble the date string (YYYY-MM-DD)
+    date = f"{year}-{month:02d}-{day:02d}"
+    # day of the year (001-366, DDD): the IGS file names always use 3 digits
+    day_of_year = f"{date_obj.timetuple().tm_yday:03d}"
+    # day of the week (0-6; Monday-Sunday in the ISO format; 7=weekly, D)
+    # Per ottenere 0=domenica, 6=sabato (formato americano), usa date_obj.weekday() + 1) % 7
+    day_of_week_iso = date_obj.weekday()  # 0-6 (lunedì-domenica)
+    day_of_week_us = (date_obj.weekday() + 1) % 7  # 0-6 (domenica-sabato)
+    # GPS week number (WWWW)
+    gps_epoch = datetime(1980, 1, 6) # the reference date for GPS is 06/01/1980
+    days_since_epoch = (date_obj - gps_epoch).days
+    gps_week = days_since_epoch // 7
+    
+    return (date, date_obj, year, f"{year % 100:02d}", day_of_year, day_of_week_iso, day_of_week_us, gps_week)
 
 class IGSDataDownloader(requests.Session):
     """
@@ -31,12 +70,36 @@ class IGSDataDownloader(requests.Session):
     _files_obj: dict
     """The files object for the data to be downloaded."""
     
+    _files_lock: threading.Lock
+    """Lock guarding the files object when the products are downloaded concurrently."""
+    
+    _pool: ThreadPoolExecutor
+    """Thread pool shared by the parallel probes of the candidate URLs."""
+    
+    _last_good_template: dict
+    """URL template that worked last time, for each product (tried first next time)."""
+    
     def __init__(self, nasaUsr: str = None, nasaPwd: str = None):
         """Initialize the IGSDataDownloader class."""
         super().__init__()
         self.auth = (nasaUsr, nasaPwd)
         self._date_obj = {}
         self._files_obj = {}
+        self._files_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='igs')
+        self._last_good_template = {'broadcast_eph': None, 'orbits': None, 'clocks': None, 'ionosphere': None}
+        # size the connection pool for the concurrent downloads (and probes) against the same host,
+        # and retry the transient errors of the server instead of moving on to the next candidate URL
+        self.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False),
+        ))
+        
+    def close(self):
+        """Close the session, shutting down the shared thread pool as well."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        super().close()
         
     def rebuild_auth(self, prepared_request, response):
         """Override the rebuild_auth method to keep headers when redirected to or from the NASA auth host."""
@@ -51,41 +114,13 @@ class IGSDataDownloader(requests.Session):
     
     def setDate(self, year: int, month: int, day: int):
         """Create the date object for the data to be downloaded."""
-        # check if the date is valid (not in the future)
-        current_date = datetime.now()
-        if datetime(year, month, day) > current_date:
+        # compute the fields (datetime raises ValueError if the date is not valid), then check the date is not in the future
+        date_obj = dict(zip(_DATE_FIELDS, _build_date_fields(year, month, day)))
+        if date_obj['date_obj'] > datetime.now():
             raise ValueError("The date cannot be in the future.")
         
-        try:
-            # assemble the date string (YYYY-MM-DD)
-            date = f"{year}-{month:02d}-{day:02d}"
-            # convert the string into a datetime object
-            date_obj = datetime.strptime(date, '%Y-%m-%d')
-            # day of the year (1-366, DDD)
-            day_of_year = date_obj.timetuple().tm_yday
-            # day of the week (0-6; Monday-Sunday in the ISO format; 7=weekly, D)
-            # Per ottenere 0=domenica, 6=sabato (formato americano), usa date_obj.weekday() + 1) % 7
-            day_of_week_iso = date_obj.weekday()  # 0-6 (lunedì-domenica)
-            day_of_week_us = (date_obj.weekday() + 1) % 7  # 0-6 (domenica-sabato)
-            # GPS week number (WWWW)
-            gps_epoch = datetime(1980, 1, 6) # the reference date for GPS is 06/01/1980
-            days_since_epoch = (date_obj - gps_epoch).days
-            gps_week = math.floor(days_since_epoch / 7)
-            
-            self._date_obj = {
-                'date_str': date,
-                'date_obj': date_obj,
-                'YYYY': year, 
-                'YY': str(year)[2:], 
-                'DDD': day_of_year, 
-                'D': day_of_week_iso, 
-                'D_us': day_of_week_us, 
-                'WWWW': gps_week
-            }
-            
-            return self._date_obj
-        except Exception as e:
-            raise Exception(f"Cannot parse this date: {date}. Error: {e}")
+        self._date_obj = date_obj
+        return self._date_obj
         
     def getDate(self) -> datetime:
         """Get the date object for the data to be downloaded."""
@@ -101,21 +136,31 @@ class IGSDataDownloader(requests.Session):
         More there: https://cddis.nasa.gov/Data_and_Derived_Products/GNSS/broadcast_ephemeris_data.html
         """
         found = False
+        d = self._date_obj
         # The starting directory for the daily files is: https://cddis.nasa.gov/archive/gnss/data/daily/
         startURL = f"{self.PROVIDER_URL}data/daily/"
         # Note, for data created before December 1, 2020, the files are Unix compressed with extension .Z
-        ext = "gz" if datetime.strptime(self._date_obj['date_str'], '%Y-%m-%d') >= datetime(2020, 12, 1) else "Z"
+        ext = "gz" if d['date_obj'] >= _GZ_CUTOFF else "Z"
         # Append the following directory and file names to the starting directory:
         # YYYY/DDD/YYn/brdcDDD0.YYn.gz   (merged GPS broadcast ephemeris file) or YYYY/brdc/brdcDDD0.YYn.gz (merged GPS broadcast ephemeris file)
-        url1 = f"{startURL}{self._date_obj['YYYY']}/{self._date_obj['DDD']}/{self._date_obj['YY']}n/brdc{self._date_obj['DDD']}0.{self._date_obj['YY']}n.{ext}"
-        url2 = f"{startURL}{self._date_obj['YYYY']}/brdc/brdc{self._date_obj['DDD']}0.{self._date_obj['YY']}n.{ext}"
+        templates = ["{YYYY}/{DDD}/{YY}n/brdc{DDD}0.{YY}n.", "{YYYY}/brdc/brdc{DDD}0.{YY}n."]
         # Here (https://cddis.nasa.gov/Data_and_Derived_Products/GNSS/daily_gps_b.html) it also appears the following path:
         # YYYY/DDD/YYn/brdcDDD0.YYn.gz   (merged GPS broadcast ephemeris file)
-        for url in [url1, url2]:
+        # try first the template that worked last time
+        templates.sort(key=lambda t: t != self._last_good_template['broadcast_eph'])
+        url = [startURL + t.format_map(d) + ext for t in templates]
+        # the file may have been downloaded by a previous run
+        cached = self._cached(url, save_path)
+        if cached is not None:
+            with self._files_lock:
+                self._files_obj['broadcast_eph'] = cached
+            return
+        for u in self._available(url):
             try:
-                
-                file_name = self.download(url, save_path)
-                self._files_obj['broadcast_eph'] = self.extract(os.path.join(save_path, file_name))
+                file_name = self.download_and_extract(u, save_path)
+                with self._files_lock:
+                    self._files_obj['broadcast_eph'] = file_name
+                self._last_good_template['broadcast_eph'] = templates[url.index(u)]
                 found = True
                 break
             except Exception as e:
@@ -129,29 +174,41 @@ class IGSDataDownloader(requests.Session):
         Precise Orbits: https://cddis.nasa.gov/Data_and_Derived_Products/GNSS/orbit_products.html
         """
         found = False
+        d = self._date_obj
 
-        url = []
-        if self._date_obj['WWWW'] <= 2237:
+        templates = []
+        if d['WWWW'] <= 2237:
             # Precise (Final) Orbit and Clock file (https://igs.org/products/#orbits_clocks)
             # Precise Orbits: https://cddis.nasa.gov/Data_and_Derived_Products/GNSS/orbit_products.html
             # - until week 2237:   https://cddis.nasa.gov/archive/gnss/products/WWWW/igsWWWWD.sp3.Z
-            url.append(f"{self.PROVIDER_URL}products/{self._date_obj['WWWW']}/igs{self._date_obj['WWWW']}{self._date_obj['D']}.sp3.Z")
+            templates.append("products/{WWWW}/igs{WWWW}{D}.sp3.Z")
         else:    
             # - from week 2338 on: 
             #      - https://cddis.nasa.gov/archive/gnss/products/wwww[/reproX]
             #      - https://cddis.nasa.gov/archive/gnss/products/latest
             #           - old name: igswwwwd.sp3.Z
             #           - new name: IGS0OPSFIN_yyyyddd0000_01D_15M_ORB.SP3.gz
-            url.append(f"{self.PROVIDER_URL}products/{self._date_obj['WWWW']}/IGS0OPSFIN_{self._date_obj['YYYY']}{self._date_obj['DDD']}0000_01D_15M_ORB.SP3.gz")
-            url.append(f"{self.PROVIDER_URL}products/latest/IGS0OPSFIN_{self._date_obj['YYYY']}{self._date_obj['DDD']}0000_01D_15M_ORB.SP3.gz")
+            templates.append("products/{WWWW}/IGS0OPSFIN_{YYYY}{DDD}0000_01D_15M_ORB.SP3.gz")
+            templates.append("products/latest/IGS0OPSFIN_{YYYY}{DDD}0000_01D_15M_ORB.SP3.gz")
             # trying also the old name
-            url.append(f"{self.PROVIDER_URL}products/{self._date_obj['WWWW']}/igs{self._date_obj['WWWW']}{self._date_obj['D']}.sp3.Z")
-            url.append(f"{self.PROVIDER_URL}products/latest/igs{self._date_obj['WWWW']}{self._date_obj['D']}.sp3.gz")
+            templates.append("products/{WWWW}/igs{WWWW}{D}.sp3.Z")
+            templates.append("products/latest/igs{WWWW}{D}.sp3.gz")
+        # try first the template that worked last time
+        templates.sort(key=lambda t: t != self._last_good_template['orbits'])
+        url = [self.PROVIDER_URL + t.format_map(d) for t in templates]
             
-        for u in url:
+        # the file may have been downloaded by a previous run
+        cached = self._cached(url, save_path)
+        if cached is not None:
+            with self._files_lock:
+                self._files_obj['orbits'] = cached
+            return
+        for u in self._available(url):
             try:
-                file_name = self.download(u, save_path)
-                self._files_obj['orbits'] = self.extract(os.path.join(save_path, file_name))
+                file_name = self.download_and_extract(u, save_path)
+                with self._files_lock:
+                    self._files_obj['orbits'] = file_name
+                self._last_good_template['orbits'] = templates[url.index(u)]
                 found = True
                 break
             except Exception as e:
@@ -165,25 +222,37 @@ class IGSDataDownloader(requests.Session):
         Precise Clocks: https://cddis.nasa.gov/Data_and_Derived_Products/GNSS/clock_products.html
         """
         found = False
-        url = []
+        d = self._date_obj
+        templates = []
         
-        if self._date_obj['WWWW'] <= 2237:
+        if d['WWWW'] <= 2237:
             # - until week 2237:   https://cddis.nasa.gov/archive/gnss/products/WWWW/igsWWWWD.clk.Z
-            url.append(f"{self.PROVIDER_URL}products/{self._date_obj['WWWW']}/igs{self._date_obj['WWWW']}{self._date_obj['D']}.clk.Z")
+            templates.append("products/{WWWW}/igs{WWWW}{D}.clk.Z")
         else:
             # - from week 2338 on:
             #      - https://cddis.nasa.gov/archive/gnss/products/wwww[/reproX]
             #      - https://cddis.nasa.gov/archive/gnss/products/latest
             #           - old name: igswwwwd.clk.Z
             #           - new name: IGS0OPSFIN_yyyyddd0000_01D_05M_CLK.CLK.gz 
-            url.append(f"{self.PROVIDER_URL}products/{self._date_obj['WWWW']}/IGS0OPSFIN_{self._date_obj['YYYY']}{self._date_obj['DDD']}0000_01D_05M_CLK.CLK.gz")
-            url.append(f"{self.PROVIDER_URL}products/latest/IGS0OPSFIN_{self._date_obj['YYYY']}{self._date_obj['DDD']}0000_01D_05M_CLK.CLK.gz")
-            url.append(f"{self.PROVIDER_URL}products/{self._date_obj['WWWW']}/igs{self._date_obj['WWWW']}{self._date_obj['D']}.clk.Z")
-            url.append(f"{self.PROVIDER_URL}products/latest/igs{self._date_obj['WWWW']}{self._date_obj['D']}.clk.gz")
-        for u in url:
+            templates.append("products/{WWWW}/IGS0OPSFIN_{YYYY}{DDD}0000_01D_05M_CLK.CLK.gz")
+            templates.append("products/latest/IGS0OPSFIN_{YYYY}{DDD}0000_01D_05M_CLK.CLK.gz")
+            templates.append("products/{WWWW}/igs{WWWW}{D}.clk.Z")
+            templates.append("products/latest/igs{WWWW}{D}.clk.gz")
+        # try first the template that worked last time
+        templates.sort(key=lambda t: t != self._last_good_template['clocks'])
+        url = [self.PROVIDER_URL + t.format_map(d) for t in templates]
+        # the file may have been downloaded by a previous run
+        cached = self._cached(url, save_path)
+        if cached is not None:
+            with self._files_lock:
+                self._files_obj['clocks'] = cached
+            return cached
+        for u in self._available(url):
             try:
-                file_name = self.download(u, save_path)
-                self._files_obj['clocks'] = self.extract(os.path.join(save_path, file_name))
+                file_name = self.download_and_extract(u, save_path)
+                with self._files_lock:
+                    self._files_obj['clocks'] = file_name
+                self._last_good_template['clocks'] = templates[url.index(u)]
                 found = True
                 break
             except Exception as e:
@@ -198,24 +267,36 @@ class IGSDataDownloader(requests.Session):
         Download the Ionosphere File (https://igs.org/products/#ionosphere and https://cddis.nasa.gov/Data_and_Derived_Products/GNSS/atmospheric_products.html)
         """
         found = False
-        url = []
+        d = self._date_obj
+        templates = []
         
-        if self._date_obj['WWWW'] <= 2237:
+        if d['WWWW'] <= 2237:
             # - until week 2237: https://cddis.nasa.gov/archive/gnss/products/ionex/YYYY/DDD/igsgddd0.yyi.Z
-            url.append(f"{self.PROVIDER_URL}products/ionex/{self._date_obj['YYYY']}/{self._date_obj['DDD']}/igsg{self._date_obj['DDD']}0.{self._date_obj['YY']}i.Z")
+            templates.append("products/ionex/{YYYY}/{DDD}/igsg{DDD}0.{YY}i.Z")
         else:
             # - from week 2238 on: https://cddis.nasa.gov/archive/gnss/products/ionex/WWWW/ (su igs dice YYYY/DDD...)
             #                      IGS0OPSFIN_yyyyddd0000_01D_02H_GIM.INX.gz (new name)
-            url.append(f"{self.PROVIDER_URL}products/ionex/{self._date_obj['WWWW']}/IGS0OPSFIN_{self._date_obj['YYYY']}{self._date_obj['DDD']}0000_01D_02H_GIM.INX.gz")
-            url.append(f"{self.PROVIDER_URL}products/ionex/{self._date_obj['YYYY']}/{self._date_obj['DDD']}/IGS0OPSFIN_{self._date_obj['YYYY']}{self._date_obj['DDD']}0000_01D_02H_GIM.INX.gz")
+            templates.append("products/ionex/{WWWW}/IGS0OPSFIN_{YYYY}{DDD}0000_01D_02H_GIM.INX.gz")
+            templates.append("products/ionex/{YYYY}/{DDD}/IGS0OPSFIN_{YYYY}{DDD}0000_01D_02H_GIM.INX.gz")
             # trying also the old name
-            url.append(f"{self.PROVIDER_URL}products/ionex/{self._date_obj['WWWW']}/igsg{self._date_obj['DDD']}0.{self._date_obj['YY']}i.Z")
-            url.append(f"{self.PROVIDER_URL}products/ionex/{self._date_obj['YYYY']}/{self._date_obj['DDD']}/igsg{self._date_obj['DDD']}0.{self._date_obj['YY']}i.Z")
+            templates.append("products/ionex/{WWWW}/igsg{DDD}0.{YY}i.Z")
+            templates.append("products/ionex/{YYYY}/{DDD}/igsg{DDD}0.{YY}i.Z")
+        # try first the template that worked last time
+        templates.sort(key=lambda t: t != self._last_good_template['ionosphere'])
+        url = [self.PROVIDER_URL + t.format_map(d) for t in templates]
         
-        for u in url:
+        # the file may have been downloaded by a previous run
+        cached = self._cached(url, save_path)
+        if cached is not None:
+            with self._files_lock:
+                self._files_obj['ionosphere'] = cached
+            return
+        for u in self._available(url):
             try:
-                file_name = self.download(u, save_path)
-                self._files_obj['ionosphere'] = self.extract(os.path.join(save_path, file_name))
+                file_name = self.download_and_extract(u, save_path)
+                with self._files_lock:
+                    self._files_obj['ionosphere'] = file_name
+                self._last_good_template['ionosphere'] = templates[url.index(u)]
                 found = True
                 break
             except Exception as e:
@@ -242,13 +323,14 @@ class IGSDataDownloader(requests.Session):
         ]
         
         found = False
+        d = self._date_obj
         url = []
         
         for site in sites:
             SSSS = site['4-digit-name']
             SITENAME = site['9-character-name']
             
-            if self._date_obj['WWWW'] <= 2237:
+            if d['WWWW'] <= 2237:
                 # - until week 2237: https://cddis.nasa.gov/archive/gnss/products/troposphere/zpd/
                 # Append the following directory and file names to the starting directory for current files: TYP/SSSSDDD#.YYzpd.gz
                 # as described in the table below.
@@ -260,7 +342,7 @@ class IGSDataDownloader(requests.Session):
                 # | YY   | 2-digit year
                 # | .gz  | gzip compressed file
                 TYP = "zpd"
-                url.append(f"{self.PROVIDER_URL}products/troposphere/{TYP}/{self._date_obj['YYYY']}/{self._date_obj['DDD']}/{SSSS}{self._date_obj['DDD']}0.{self._date_obj['YY']}zpd.gz")
+                template = "products/troposphere/{TYP}/{YYYY}/{DDD}/{SSSS}{DDD}0.{YY}zpd.gz"
             else:
                 # - from week 2238 on: https://cddis.nasa.gov/archive/gnss/products/troposphere/zpd/
                 # Append the following directory and file names to the starting directory for current files: YYYY/IGS0OPSFIN_YYYYDOYHHMM_01D_05M_SITENAME_TRO.TRO.gz
@@ -273,14 +355,21 @@ class IGSDataDownloader(requests.Session):
                 # | SITENAME | 9 character site name
                 # | .gz      | gzip compressed file
                 TYP = "zpd"
-                HH = "00"
-                MM = "00"
-                url.append(f"{self.PROVIDER_URL}products/troposphere/{TYP}/{self._date_obj['YYYY']}/{self._date_obj['DDD']}/IGS0OPSFIN_{self._date_obj['YYYY']}{self._date_obj['DDD']}{HH}{MM}_01D_05M_{SITENAME}_TRO.TRO.gz")
+                template = "products/troposphere/{TYP}/{YYYY}/{DDD}/IGS0OPSFIN_{YYYY}{DDD}{HH}{MM}_01D_05M_{SITENAME}_TRO.TRO.gz"
+            url.append(self.PROVIDER_URL + template.format_map({**d, 'TYP': TYP, 'SSSS': SSSS, 'SITENAME': SITENAME, 'HH': "00", 'MM': "00"}))
     
-        for u in url:
+        # the file may have been downloaded by a previous run
+        cached = self._cached(url, save_path)
+        if cached is not None:
+            with self._files_lock:
+                self._files_obj['troposphere'] = cached
+            return
+        # any site will do: take the first one that answers, whatever its position in the list
+        for u in self._available(url, ordered=False):
             try:
-                file_name = self.download(u, save_path)
-                self._files_obj['troposphere'] = self.extract(os.path.join(save_path, file_name))
+                file_name = self.download_and_extract(u, save_path)
+                with self._files_lock:
+                    self._files_obj['troposphere'] = file_name
                 found = True
                 break
             except Exception as e:
@@ -288,42 +377,105 @@ class IGSDataDownloader(requests.Session):
         if not found:
             raise Exception(f"cannot find the troposphere .tro file in {SITENAME}.")
     
-    def download(self, url: str, save_path: str):
-        """Download a file from the given URL and save it to the specified path."""
-        print(url)
+    def downloadAll(self, save_path: str, callback=None) -> dict:
+        """
+        Download all the IGS products concurrently (they are independent requests against the same host).
+        If a callback is given, it is called with the name of each product as soon as it is downloaded.
+        Return the files object; if a product cannot be downloaded, its exception is raised.
+        The products are not submitted to the shared pool: they wait on their own probes there, and could fill it up.
+        """
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = {
+                executor.submit(self.downloadBroadcastEphemeris, save_path): "Broadcast ephemeris",
+                executor.submit(self.downloadPreciseFinalOrbit, save_path): "Precise final orbit",
+                executor.submit(self.downloadPreciseFinalClock, save_path): "Precise final clock",
+                executor.submit(self.downloadIonosphere, save_path): "Ionosphere data",
+                executor.submit(self.downloadTroposhpere, save_path): "Troposhpere data",
+            }
+            for future in as_completed(futures):
+                future.result()
+                if callback is not None:
+                    callback(futures[future])
+        return self._files_obj
+    
+    def _available(self, urls: list[str], ordered: bool = True):
+        """
+        Probe all the candidate URLs in parallel (HEAD requests) and yield the ones worth a GET.
+        The URLs found (200) are yielded first: if ordered is True, in their original order of priority; otherwise, as soon as their probe succeeds.
+        The URLs whose probe is inconclusive (HEAD rejected, timed out or answered with anything but 200/404/410) are yielded last, as a fallback:
+        only the ones reported missing are never tried.
+        The probes reuse the pooled connections of the session.
+        """
+        def probe(url):
+            # True: available, False: missing, None: unknown (to be tried with a GET anyway)
+            try:
+                status = self.head(url, allow_redirects=True, timeout=10).status_code
+            except requests.exceptions.RequestException:
+                return None
+            if status == 200:
+                return True
+            return False if status in (404, 410) else None
+        futures = {self._pool.submit(probe, url): url for url in urls}
+        unknown = []
         try:
-            # submit the request using the session
-            response = self.get(url, stream=True)
-            # raise an exception in case of http errors
-            response.raise_for_status()
-            # save the file
-            file_name = os.path.basename(url)
-            with open(os.path.join(save_path, file_name), 'wb') as fd:
-                for chunk in response.iter_content(chunk_size=1024 * 1024):
-                    fd.write(chunk)
-            return file_name
-        except requests.exceptions.HTTPError as e:
-            raise Exception(f"HTTP error occurred: {e}")
+            for future in (futures if ordered else as_completed(futures)):
+                result = future.result()
+                if result:
+                    yield futures[future]
+                elif result is None:
+                    unknown.append(futures[future])
+            yield from unknown
+        finally:
+            # the caller may stop at the first URL: do not wait for the remaining probes
+            for future in futures:
+                future.cancel()
+    
+    def _extracted_path(self, url: str, save_path: str) -> str:
+        """Return the path of the file extracted from the given URL into the specified path."""
+        file_name = os.path.basename(url)
+        if file_name.endswith('.gz'):
+            file_name = file_name[:-3]
+        elif file_name.endswith('.Z'):
+            file_name = file_name[:-2]
+        return os.path.join(save_path, file_name)
+    
+    def _cached(self, urls: list[str], save_path: str) -> str | None:
+        """Return the first file already extracted (and not empty) from the candidate URLs into the specified path, if any."""
+        for url in urls:
+            out_file = self._extracted_path(url, save_path)
+            if os.path.isfile(out_file) and os.path.getsize(out_file) > 0:
+                return out_file
+        return None
     
-    def extract(self, save_path: str):
-        """Extract the downloaded file if it is compressed."""
+    def download_and_extract(self, url: str, save_path: str) -> str:
+        """
+        Download a file from the given URL and extract it on the fly (if compressed) into the specified path.
+        The response is decompressed while it is received, so the compressed file is never written to disk.
+        """
+        logger.info("Downloading %s", url)
+        file_name = os.path.basename(url)
+        out_file = self._extracted_path(url, save_path)
+        # write to a temporary file first, so that an interrupted download never leaves a truncated product behind
+        part_file = f"{out_file}.part"
         try:
-            # get the name of the downloaded file
-            file_name = os.path.join(save_path)
-            # check if the file is compressed
-            if file_name.endswith('.gz'):
-                # os.system(f"gunzip {file_name}")
-                with gzip.open(file_name, "rb") as infile:
-                    with open(file_name[:-3], "wb") as outfile:
-                        shutil.copyfileobj(infile, outfile)
-                os.remove(file_name)
-                return file_name[:-3]
-            elif file_name.endswith('.Z'):
-                # os.system(f"uncompress {file_name}")
-                uncompressed_data = unlzw3.unlzw(Path(file_name).read_bytes())
-                with open(file_name[:-2], 'wb') as output:
-                    output.write(uncompressed_data)
-                os.remove(file_name)
-                return file_name[:-2]
-        except Exception as e:
-            raise Exception(f"Cannot extract the file {file_name}. Error: {e}")
\ No newline at end of file
+            # submit the request using the session (the products are already compressed: no transfer encoding)
+            with self.get(url, stream=True, headers={'Accept-Encoding': 'identity'}) as response:
+                # raise an exception in case of http errors
+                response.raise_for_status()
+                # undo any transfer encoding the server might still apply (only the file compression is left)
+                response.raw.decode_content = True
+                with open(part_file, 'wb') as outfile:
+                    if file_name.endswith('.gz'):
+                        with io.BufferedReader(gzip.open(response.raw, "rb"), buffer_size=READ_BUFFER_SIZE) as infile:
+                            shutil.copyfileobj(infile, outfile, length=READ_BUFFER_SIZE)
+                    elif file_name.endswith('.Z'):
+                        ncompress.decompress(response.raw, outfile)
+                    else:
+                        shutil.copyfileobj(response.raw, outfile, length=READ_BUFFER_SIZE)
+            os.replace(part_file, out_file)
+            return out_file
+        except requests.exceptions.HTTPError as e:
+            raise Exception(f"HTTP error occurred: {e}")
+        finally:
+            if os.path.exists(part_file):
+                os.remove(part_file)
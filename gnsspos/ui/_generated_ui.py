@@ -0,0 +1,301 @@
+# Generated UI forms of GNSSPos, kept apart from the hand-written code in gui.py.
+# Python caches the compiled bytecode of this module, so the long setupUi methods are not re-parsed at every launch.
+import os
+from PyQt6 import QtWidgets, QtCore, QtGui
+
+# Qt enums used while building the UI, resolved once at import time
+_ALIGN_R = QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignTrailing | QtCore.Qt.AlignmentFlag.AlignVCenter
+_ALIGN_L = QtCore.Qt.AlignmentFlag.AlignLeading | QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter
+_ROLE_LABEL = QtWidgets.QFormLayout.ItemRole.LabelRole
+_ROLE_FIELD = QtWidgets.QFormLayout.ItemRole.FieldRole
+_HLINE = QtWidgets.QFrame.Shape.HLine
+_SUNKEN = QtWidgets.QFrame.Shadow.Sunken
+
+_LOGO_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', "logo.png"))
+_LOGO_KEY = "gnsspos-logo"
+
+# Texts of the widgets, as (attribute name, text) pairs
+_MAIN_WINDOW_TEXTS = (
+    ("lblGeneralSettings", "General Settings"),
+    ("lblWorkingDirectory", "Working Directory:"),
+    ("btnChooseDirectory", "..."),
+    ("lblDate", "Selected Date:"),
+    ("lblSelectedDate", "dd/mm/yyyy"),
+    ("lbl4DigitYYYY", "4-digit year (YYYY):"),
+    ("lblYYYY", "YYYY"),
+    ("lbl2DigitYY", "2-digit year (YY):"),
+    ("lblYY", "YY"),
+    ("lbl4DigitWWWW", "4-digit GPS week (WWWW):"),
+    ("lblWWWW", "WWWW"),
+    ("lbl3DigitDDD", "3-digit day of year (DDD):"),
+    ("lblDDD", "DDD"),
+    ("lbl1DigitD", "1-digit day of week (D):"),
+    ("lblD", "D"),
+    ("chkStartingTime", "Starting Time:"),
+    ("chkEndTime", "End Time:"),
+    ("chkTimeInterval", "Time Interval:"),
+    ("lblIGSDataProvider", "IGS Data Provider:"),
+    ("btnDownloadIGSData", "Download Data"),
+    ("lblRovers", "Rovers"),
+    ("btnSetupThresholds", "Setup Thresholds"),
+    ("btnSetupDistances", "Setup Distances"),
+    ("btnAddRover", "Add Rover"),
+    ("btnDeleteRover", "Delete Selected Rover"),
+    ("lblBaseStation", "Base Station"),
+    ("lblBaseStationOBS", "OBS File:"),
+    ("btnChooseBaseStationOBS", "..."),
+    ("btnRUN", "RUN"),
+    ("btnPlotPositions", "PLOT SOLUTIONS"),
+)
+_MAIN_WINDOW_PLACEHOLDERS = (
+    ("txtWorkingDirectory", "press the button aside to choose the working directory..."),
+    ("txtBaseStationOBS", "press the button aside to choose an .OBS file..."),
+)
+_ROVER_TAB_TEXTS = (
+    ("lblChooseRoverOBS", "OBS File:"),
+    ("btnChooseRoverOBS", "..."),
+)
+_ROVER_TAB_PLACEHOLDERS = (
+    ("txtRoverOBSFile", "press the button aside to choose an .OBS file..."),
+)
+
+
+def logo_icon() -> QtGui.QIcon:
+    """Return the GNSSPos icon, used by all the windows. The logo is decoded from disk once, then kept in QPixmapCache."""
+    pixmap = QtGui.QPixmapCache.find(_LOGO_KEY)
+    if pixmap is None or pixmap.isNull():
+        pixmap = QtGui.QPixmap(_LOGO_PATH)
+        QtGui.QPixmapCache.insert(_LOGO_KEY, pixmap)
+    icon = QtGui.QIcon()
+    icon.addPixmap(pixmap)
+    return icon
+
+
+class Ui_MainWindow(object):
+    _FONTS = None
+    """Fonts shared by the widgets of the main window, built on the first setupUi call."""
+    
+    @classmethod
+    def _fonts(cls):
+        """Build the fonts of the main window once, then reuse them."""
+        if cls._FONTS is None:
+            title = QtGui.QFont()
+            title.setPointSize(12)
+            title.setBold(True)
+            title.setWeight(75)
+            bold = QtGui.QFont()
+            bold.setBold(True)
+            bold.setWeight(75)
+            run = QtGui.QFont()
+            run.setPointSize(14)
+            run.setBold(False)
+            run.setWeight(50)
+            run.setKerning(False)
+            button = QtGui.QFont()
+            button.setPointSize(14)
+            cls._FONTS = {"title": title, "bold": bold, "run": run, "button": button}
+        return cls._FONTS
+        
+    # Form implementation generated from reading ui file 'GUI.ui'
+    #
+    # Created by: PyQt6 UI code generator 6.4.2
+    #
+    # WARNING: Any manual changes made to this file will be lost when pyuic6 is
+    # run again.  Do not edit this file unless you know what you are doing.
+    def setupUi(self, MainWindow):
+        fonts = self._fonts()
+        # no repaints while the widgets are being built
+        MainWindow.setUpdatesEnabled(False)
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(595, 679)
+        self.centralwidget = QtWidgets.QWidget(parent=MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout = QtWidgets.QGridLayout(self.centralwidget)
+        self.lblGeneralSettings = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lblGeneralSettings.setFont(fonts["title"])
+        self.gridLayout.addWidget(self.lblGeneralSettings, 0, 0, 1, 1)
+        self.hlyworkingDirectory = QtWidgets.QHBoxLayout()
+        self.lblWorkingDirectory = QtWidgets.QLabel(parent=self.centralwidget)
+        self.hlyworkingDirectory.addWidget(self.lblWorkingDirectory)
+        self.txtWorkingDirectory = QtWidgets.QLineEdit(parent=self.centralwidget)
+        self.hlyworkingDirectory.addWidget(self.txtWorkingDirectory)
+        self.btnChooseDirectory = QtWidgets.QToolButton(parent=self.centralwidget)
+        self.hlyworkingDirectory.addWidget(self.btnChooseDirectory)
+        self.gridLayout.addLayout(self.hlyworkingDirectory, 1, 0, 1, 1)
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
+        self.calDateTime = QtWidgets.QCalendarWidget(parent=self.centralwidget)
+        self.horizontalLayout_2.addWidget(self.calDateTime)
+        self.verticalLayout = QtWidgets.QVBoxLayout()
+        self.formLayout = QtWidgets.QFormLayout()
+        self.formLayout.setLabelAlignment(_ALIGN_R)
+        self.formLayout.setFormAlignment(_ALIGN_L)
+        self.lblDate = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lblDate.setAlignment(_ALIGN_R)
+        self.formLayout.setWidget(0, _ROLE_LABEL, self.lblDate)
+        self.lblSelectedDate = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lblSelectedDate.setFont(fonts["bold"])
+        self.formLayout.setWidget(0, _ROLE_FIELD, self.lblSelectedDate)
+        self.lbl4DigitYYYY = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lbl4DigitYYYY.setAlignment(_ALIGN_R)
+        self.formLayout.setWidget(1, _ROLE_LABEL, self.lbl4DigitYYYY)
+        self.lblYYYY = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lblYYYY.setFont(fonts["bold"])
+        self.formLayout.setWidget(1, _ROLE_FIELD, self.lblYYYY)
+        self.lbl2DigitYY = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lbl2DigitYY.setAlignment(_ALIGN_R)
+        self.formLayout.setWidget(2, _ROLE_LABEL, self.lbl2DigitYY)
+        self.lblYY = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lblYY.setFont(fonts["bold"])
+        self.formLayout.setWidget(2, _ROLE_FIELD, self.lblYY)
+        self.lbl4DigitWWWW = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lbl4DigitWWWW.setAlignment(_ALIGN_R)
+        self.formLayout.setWidget(3, _ROLE_LABEL, self.lbl4DigitWWWW)
+        self.lblWWWW = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lblWWWW.setFont(fonts["bold"])
+        self.formLayout.setWidget(3, _ROLE_FIELD, self.lblWWWW)
+        self.lbl3DigitDDD = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lbl3DigitDDD.setAlignment(_ALIGN_R)
+        self.formLayout.setWidget(4, _ROLE_LABEL, self.lbl3DigitDDD)
+        self.lblDDD = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lblDDD.setFont(fonts["bold"])
+        self.formLayout.setWidget(4, _ROLE_FIELD, self.lblDDD)
+        self.lbl1DigitD = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lbl1DigitD.setAlignment(_ALIGN_R)
+        self.formLayout.setWidget(5, _ROLE_LABEL, self.lbl1DigitD)
+        self.lblD = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lblD.setFont(fonts["bold"])
+        self.formLayout.setWidget(5, _ROLE_FIELD, self.lblD)
+        self.verticalLayout.addLayout(self.formLayout)
+        self.hlyStartTime = QtWidgets.QHBoxLayout()
+        self.chkStartingTime = QtWidgets.QCheckBox(parent=self.centralwidget)
+        self.hlyStartTime.addWidget(self.chkStartingTime)
+        self.txtStartingTime = QtWidgets.QTimeEdit(parent=self.centralwidget)
+        self.hlyStartTime.addWidget(self.txtStartingTime)
+        self.verticalLayout.addLayout(self.hlyStartTime)
+        self.hlyEndTime = QtWidgets.QHBoxLayout()
+        self.chkEndTime = QtWidgets.QCheckBox(parent=self.centralwidget)
+        self.hlyEndTime.addWidget(self.chkEndTime)
+        self.txtEndTime = QtWidgets.QTimeEdit(parent=self.centralwidget)
+        self.hlyEndTime.addWidget(self.txtEndTime)
+        self.verticalLayout.addLayout(self.hlyEndTime)
+        self.hlyTimeInterval = QtWidgets.QHBoxLayout()
+        self.chkTimeInterval = QtWidgets.QCheckBox(parent=self.centralwidget)
+        self.hlyTimeInterval.addWidget(self.chkTimeInterval)
+        self.cmbTimeInterval = QtWidgets.QComboBox(parent=self.centralwidget)
+        self.hlyTimeInterval.addWidget(self.cmbTimeInterval)
+        self.verticalLayout.addLayout(self.hlyTimeInterval)
+        self.horizontalLayout_2.addLayout(self.verticalLayout)
+        self.gridLayout.addLayout(self.horizontalLayout_2, 2, 0, 1, 1)
+        self.hlyIGSProvider = QtWidgets.QHBoxLayout()
+        self.lblIGSDataProvider = QtWidgets.QLabel(parent=self.centralwidget)
+        self.hlyIGSProvider.addWidget(self.lblIGSDataProvider)
+        self.cmbIGSDataProvider = QtWidgets.QComboBox(parent=self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.cmbIGSDataProvider.sizePolicy().hasHeightForWidth())
+        self.cmbIGSDataProvider.setSizePolicy(sizePolicy)
+        self.hlyIGSProvider.addWidget(self.cmbIGSDataProvider)
+        self.btnDownloadIGSData = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.hlyIGSProvider.addWidget(self.btnDownloadIGSData)
+        self.gridLayout.addLayout(self.hlyIGSProvider, 3, 0, 1, 1)
+        self.line = QtWidgets.QFrame(parent=self.centralwidget)
+        self.line.setFrameShape(_HLINE)
+        self.line.setFrameShadow(_SUNKEN)
+        self.gridLayout.addWidget(self.line, 4, 0, 1, 1)
+        self.vlyRoversBase = QtWidgets.QVBoxLayout()
+        self.vlyRovers = QtWidgets.QVBoxLayout()
+        self.lblRovers = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lblRovers.setFont(fonts["title"])
+        self.vlyRovers.addWidget(self.lblRovers)
+        self.hlyRoverButtons = QtWidgets.QHBoxLayout()
+        self.btnSetupThresholds = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.hlyRoverButtons.addWidget(self.btnSetupThresholds)
+        self.btnSetupDistances = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.hlyRoverButtons.addWidget(self.btnSetupDistances)
+        self.btnAddRover = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.hlyRoverButtons.addWidget(self.btnAddRover)
+        self.btnDeleteRover = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.btnDeleteRover.setEnabled(False)
+        self.hlyRoverButtons.addWidget(self.btnDeleteRover)
+        self.vlyRovers.addLayout(self.hlyRoverButtons)
+        self.tabsRover = QtWidgets.QTabWidget(parent=self.centralwidget)
+        self.tabsRover.setObjectName("tabsRover")
+        self.vlyRovers.addWidget(self.tabsRover)
+        self.vlyRoversBase.addLayout(self.vlyRovers)
+        self.vlyBaseStation = QtWidgets.QVBoxLayout()
+        self.lblBaseStation = QtWidgets.QLabel(parent=self.centralwidget)
+        self.lblBaseStation.setFont(fonts["title"])
+        self.vlyBaseStation.addWidget(self.lblBaseStation)
+        self.hlyOBSFileName = QtWidgets.QHBoxLayout()
+        self.lblBaseStationOBS = QtWidgets.QLabel(parent=self.centralwidget)
+        self.hlyOBSFileName.addWidget(self.lblBaseStationOBS)
+        self.txtBaseStationOBS = QtWidgets.QLineEdit(parent=self.centralwidget)
+        self.hlyOBSFileName.addWidget(self.txtBaseStationOBS)
+        self.btnChooseBaseStationOBS = QtWidgets.QToolButton(parent=self.centralwidget)
+        self.hlyOBSFileName.addWidget(self.btnChooseBaseStationOBS)
+        self.vlyBaseStation.addLayout(self.hlyOBSFileName)
+        self.vlyRoversBase.addLayout(self.vlyBaseStation)
+        self.gridLayout.addLayout(self.vlyRoversBase, 5, 0, 1, 1)
+        self.line_3 = QtWidgets.QFrame(parent=self.centralwidget)
+        self.line_3.setFrameShape(_HLINE)
+        self.line_3.setFrameShadow(_SUNKEN)
+        self.gridLayout.addWidget(self.line_3, 6, 0, 1, 1)
+        self.hlyButtons = QtWidgets.QHBoxLayout()
+        self.btnRUN = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.btnRUN.setFont(fonts["run"])
+        self.hlyButtons.addWidget(self.btnRUN)
+        self.btnPlotPositions = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.btnPlotPositions.setFont(fonts["button"])
+        self.hlyButtons.addWidget(self.btnPlotPositions)
+        self.gridLayout.addLayout(self.hlyButtons, 7, 0, 1, 1)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.menubar = QtWidgets.QMenuBar(parent=MainWindow)
+        self.menubar.setGeometry(QtCore.QRect(0, 0, 595, 22))
+        MainWindow.setMenuBar(self.menubar)
+        self.statusbar = QtWidgets.QStatusBar(parent=MainWindow)
+        MainWindow.setStatusBar(self.statusbar)
+        MainWindow.setWindowIcon(logo_icon())
+        MainWindow.setUpdatesEnabled(True)
+
+        self.retranslateUi(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        # no translations are installed: the texts are set directly, from the module-level tables
+        MainWindow.setWindowTitle("GNSSPos")
+        for name, text in _MAIN_WINDOW_TEXTS:
+            getattr(self, name).setText(text)
+        for name, text in _MAIN_WINDOW_PLACEHOLDERS:
+            getattr(self, name).setPlaceholderText(text)
+    ### --- END OF GENERATED CODE ---
+
+
+# Form implementation generated from reading ui file 'RoverTab.ui'
+#
+# Created by: PyQt6 UI code generator 6.4.2
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic6 is
+# run again.  Do not edit this file unless you know what you are doing.
+class Ui_RoverTab(object):
+
+    def setupUi(self, RoverTab):
+        RoverTab.setObjectName("RoverTab")
+        RoverTab.resize(404, 43)
+        self.gridLayout = QtWidgets.QGridLayout(RoverTab)
+        self.lblChooseRoverOBS = QtWidgets.QLabel(parent=RoverTab)
+        self.gridLayout.addWidget(self.lblChooseRoverOBS, 0, 0, 1, 1)
+        self.txtRoverOBSFile = QtWidgets.QLineEdit(parent=RoverTab)
+        self.gridLayout.addWidget(self.txtRoverOBSFile, 0, 1, 1, 1)
+        self.btnChooseRoverOBS = QtWidgets.QToolButton(parent=RoverTab)
+        self.gridLayout.addWidget(self.btnChooseRoverOBS, 0, 2, 1, 1)
+
+        self.retranslateUi(RoverTab)
+
+    def retranslateUi(self, RoverTab):
+        # no translations are installed: the texts are set directly, from the module-level tables
+        RoverTab.setWindowTitle("Form")
+        for name, text in _ROVER_TAB_TEXTS:
+            getattr(self, name).setText(text)
+        for name, text in _ROVER_TAB_PLACEHOLDERS:
+            getattr(self, name).setPlaceholderText(text)
+    # --- END OF GENERATED CODE ---
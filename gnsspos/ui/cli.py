@@ -10,6 +10,8 @@ class CLI(UserInterface):
     It provides methods for displaying messages, errors, and progress updates in the console.
     """
     
+    __slots__ = ("logger",)
+    
     def __init__(self, gnsspos, logger):
         """Initialize the CLI interface."""
         super().setController(gnsspos)
@@ -1,36 +1,71 @@
 from gnsspos.gnsspos import GNSSPos
 from gnsspos.rover import Rover
 from gnsspos.ui.user_interface import UserInterface
-from time import sleep
+from functools import partial
+from itertools import combinations
 
 import sys
-import os
 from PyQt6 import QtWidgets, QtCore, QtGui
+from gnsspos.ui import _generated_ui
 
+# Qt enums used by the GUI, resolved once at import time
+_WINDOW_FLAGS = QtCore.Qt.WindowType.WindowCloseButtonHint | QtCore.Qt.WindowType.WindowMinimizeButtonHint
 
-class GUI(UserInterface):
+
+class GUI(UserInterface, _generated_ui.Ui_MainWindow):
     """
     Graphic User Interface (GUI) for GNSSPos.
     This class implements the UserInterface abstract base class for the graphical user interface.
     It uses PyQt to create and manage the GUI components.
     """
     
+    _LOG_STYLES = {
+        "info": "QStatusBar { background-color: lightgray; }",
+        "warning": "QStatusBar { background-color: yellow; }",
+        "error": "QStatusBar { background-color: red; }",
+    }
+    """Status bar stylesheet for each log level."""
+    
     def __init__(self, gnsspos, logger, mainWindow):
         """Initialize the GUI interface."""
         super().setController(gnsspos)
+        # cache the controller and the IGS downloader, used by almost every slot
+        self._controller = gnsspos
+        self._downloader = gnsspos.getIGSDownloader()
         self.logger = logger
         self.mainWindow = mainWindow
         self._checks = {}
+        # number of checks currently False, kept in sync by setCheck
+        self._pendingChecks = 0
+        # True while the processing worker is running
+        self._running = False
+        # stylesheet currently set on the status bar
+        self._currentLogStyle = None
+        # calendar clicks are coalesced: only the last one in 100 ms updates the date
+        self._dateTimer = QtCore.QTimer(self.mainWindow)
+        self._dateTimer.setSingleShot(True)
+        self._dateTimer.setInterval(100)
+        self._dateTimer.timeout.connect(self._doChooseObservationDate)
+        self._lastDateKey = None
+        # date the running IGS download was started for
+        self._igsDateKey = None
         
     def start(self):
         """Start the GUI interface."""
         self.setupUi(self.mainWindow)
-        self.mainWindow.setWindowFlags(QtCore.Qt.WindowType.WindowCloseButtonHint | QtCore.Qt.WindowType.WindowMinimizeButtonHint)
+        self.mainWindow.setWindowFlags(_WINDOW_FLAGS)
         self.mainWindow.show()
+        # pending checks are highlighted through the "checkState" dynamic property (see setCheck)
+        self.mainWindow.setStyleSheet('*[checkState="pending"] { background-color: lightyellow; }')
         
         # Add status bar
         self.statusBar = QtWidgets.QStatusBar(self.mainWindow)
         self.mainWindow.setStatusBar(self.statusBar)
+        # single timer used to clear the status bar: restarting it drops any pending clear
+        self._statusTimer = QtCore.QTimer(self.mainWindow)
+        self._statusTimer.setSingleShot(True)
+        self._statusTimer.setInterval(2000)
+        self._statusTimer.timeout.connect(self._clearStatus)
         
         # Disable fields
         self.txtStartingTime.setEnabled(False)
@@ -57,40 +92,49 @@ class GUI(UserInterface):
         # Set the default date in the calendar
         self.calDateTime.setSelectedDate(QtCore.QDate.currentDate())
         self.calDateTime.setGridVisible(True)
-        self.chooseObservationDate()
+        self._doChooseObservationDate()
         
         # Fill the time interval combo box and select the default value
-        for i in [1, 2, 5, 10, 15, 30, 60]:
-            self.cmbTimeInterval.addItem(str(i))
+        self.cmbTimeInterval.addItems([str(i) for i in (1, 2, 5, 10, 15, 30, 60)])
         self.cmbTimeInterval.setCurrentText("1")
         
         # Add the IGS data providers to the combo box
-        self.cmbIGSDataProvider.addItem(super().getController().getIGSDownloader().PROVIDER_URL)
-        self.cmbIGSDataProvider.setCurrentText(super().getController().getIGSDownloader().PROVIDER_URL)
+        self.cmbIGSDataProvider.addItem(self._downloader.PROVIDER_URL)
+        self.cmbIGSDataProvider.setCurrentText(self._downloader.PROVIDER_URL)
         self.cmbIGSDataProvider.setEnabled(True)
         
         # Remove all the rovers from the list
-        self.tabsRover.clear()
-        super().getController().clearRovers()
+        self._controller.clearRovers()
         
         # Log the initial message
         self.log("Select a working directory to start using GNSSPos.", level="info")
         
         # Connect signals to slots (add event handlers)
-        self.chkStartingTime.clicked.connect(self.toggleStartingTime)
-        self.chkEndTime.clicked.connect(self.toggleEndTime)
-        self.chkTimeInterval.clicked.connect(self.toggleTimeInterval)
-        
-        self.btnChooseDirectory.clicked.connect(self.chooseWorkingDirectory)
-        self.calDateTime.clicked.connect(self.chooseObservationDate)
-        self.btnDownloadIGSData.clicked.connect(self.downloadIGSData)
-        self.btnAddRover.clicked.connect(self.addRover)
-        self.btnDeleteRover.clicked.connect(self.deleteSelectedRover)
-        self.btnChooseBaseStationOBS.clicked.connect(self.chooseBaseStationOBSFile)
-        self.btnSetupThresholds.clicked.connect(self.setupThresholds)
-        self.btnSetupDistances.clicked.connect(self.setupDistances)
-        self.btnRUN.clicked.connect(self.run)
-        self.btnPlotPositions.clicked.connect(self.plotPositions)
+        self._connections = [
+            (self.chkStartingTime.clicked, self.toggleStartingTime),
+            (self.chkEndTime.clicked, self.toggleEndTime),
+            (self.chkTimeInterval.clicked, self.toggleTimeInterval),
+            (self.btnChooseDirectory.clicked, self.chooseWorkingDirectory),
+            (self.calDateTime.clicked, self.chooseObservationDate),
+            (self.btnDownloadIGSData.clicked, self.downloadIGSData),
+            (self.btnAddRover.clicked, self.addRover),
+            (self.btnDeleteRover.clicked, self.deleteSelectedRover),
+            (self.btnChooseBaseStationOBS.clicked, self.chooseBaseStationOBSFile),
+            (self.btnSetupThresholds.clicked, self.setupThresholds),
+            (self.btnSetupDistances.clicked, self.setupDistances),
+            (self.btnRUN.clicked, self.run),
+            (self.btnPlotPositions.clicked, self.plotPositions),
+        ]
+        for signal, slot in self._connections:
+            signal.connect(slot)
+        # disconnect everything when the application quits
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.stop)
+        
+    def stop(self):
+        """Disconnect all the signals connected in start(); called when the application is about to quit."""
+        for signal, slot in self._connections:
+            signal.disconnect(slot)
+        self._connections = []
         
     def toggleStartingTime(self):
         """Toggle the starting time field."""
@@ -109,8 +153,10 @@ class GUI(UserInterface):
         try:
             directory = QtWidgets.QFileDialog.getExistingDirectory(self.mainWindow, "Select Working Directory")
             if directory:
-                self.txtWorkingDirectory.setText(f"{directory}/")
-                super().getController().setWorkdir(directory)
+                # nobody listens to the text field signals
+                with QtCore.QSignalBlocker(self.txtWorkingDirectory):
+                    self.txtWorkingDirectory.setText(QtCore.QDir.toNativeSeparators(directory) + QtCore.QDir.separator())
+                self._controller.setWorkdir(directory)
                 self.log(f"Working directory correctly set to: {directory}. Pick the date on the calendar, then download the IGS data.")
                 # enable the download button
                 self.btnDownloadIGSData.setEnabled(True)
@@ -120,54 +166,101 @@ class GUI(UserInterface):
             self.log(f"Error selecting working directory: {e}", level="error")
             
     def chooseObservationDate(self):
+        """Schedule the update of the observation date, restarting the timer on every click."""
+        self._dateTimer.start()
+        
+    def _doChooseObservationDate(self):
         """Take the selected date from the calendar, convert and set the date in the labels."""
         try:
             date = self.calDateTime.selectedDate()
+            key = (date.year(), date.month(), date.day())
+            if key == self._lastDateKey:
+                # same date as before: labels and downloader are already up to date
+                return
             
             if self.lblSelectedDate.text() != date.toString("yyyy-MM-dd") and self.lblSelectedDate.text() != "dd/MM/yyyy": # and self.btnDownloadIGSData.isEnabled():
                 # the user has changed the date after having already selected it once
                 self.setCheck('igsData', False)
                 
-            date_dict = super().getController().getIGSDownloader().setDate(date.year(), date.month(), date.day())
-            self.lblSelectedDate.setText(date_dict['date_str'])
-            self.lblYYYY.setText(str(date_dict['YYYY']))
-            self.lblYY.setText(str(date_dict['YY']))
-            self.lblDDD.setText(str(date_dict['DDD']))
-            self.lblD.setText(str(date_dict['D']))
-            self.lblWWWW.setText(str(date_dict['WWWW']))
+            date_dict = self._downloader.setDate(*key)
+            self._lastDateKey = key
+            self._updateLabel(self.lblSelectedDate, date_dict['date_str'])
+            self._updateLabel(self.lblYYYY, date_dict['YYYY'])
+            self._updateLabel(self.lblYY, date_dict['YY'])
+            self._updateLabel(self.lblDDD, date_dict['DDD'])
+            self._updateLabel(self.lblD, date_dict['D'])
+            self._updateLabel(self.lblWWWW, date_dict['WWWW'])
         except Exception as e:
             self.log(f"Error selecting observation date: {e}", level="error")
             
+    def _updateLabel(self, label, text):
+        """Set the text of a label, only if it has changed (setText always repaints)."""
+        text = str(text)
+        if label.text() != text:
+            label.setText(text)
+            
     def downloadIGSData(self):
-        """Download the IGS data from the selected provider."""
+        """Download the IGS data from the selected provider, in a background thread."""
         try:
-            # download the data
-            super().getController().getIGSDownloader().downloadBroadcastEphemeris(super().getController().getWorkdir())
-            self.log("Broadcast ephemeris downloaded successfully.")
-            super().getController().getIGSDownloader().downloadPreciseFinalOrbit(super().getController().getWorkdir())
-            self.log("Precise final orbit downloaded successfully.")
-            super().getController().getIGSDownloader().downloadPreciseFinalClock(super().getController().getWorkdir())
-            self.log("Precise final clock downloaded successfully.")
-            super().getController().getIGSDownloader().downloadIonosphere(super().getController().getWorkdir())
-            self.log("Ionosphere data downloaded successfully.")
-            super().getController().getIGSDownloader().downloadTroposhpere(super().getController().getWorkdir())
-            self.log("Troposhpere data downloaded successfully.")
+            # a calendar click still waiting in the debounce timer is applied before starting
+            if self._dateTimer.isActive():
+                self._dateTimer.stop()
+                self._doChooseObservationDate()
+            # the downloader is shared with the worker: date and directory cannot change until it has finished
+            self._igsDateKey = self._lastDateKey
+            self._setIGSInputsEnabled(False)
+            # the files are being replaced: no processing can start until they are all downloaded
+            self.setCheck('igsData', False)
+            # the downloads run in a worker thread, so the GUI stays responsive
+            self._igsThread = QtCore.QThread(self.mainWindow)
+            self._igsWorker = IGSDownloadWorker(self._downloader, self._controller.getWorkdir())
+            self._igsWorker.moveToThread(self._igsThread)
+            self._igsThread.started.connect(self._igsWorker.run)
+            self._igsWorker.progress.connect(self.log)
+            self._igsWorker.finished.connect(self._onIGSDone)
+            self._igsWorker.finished.connect(self._igsThread.quit)
+            self._igsWorker.finished.connect(self._igsWorker.deleteLater)
+            self._igsThread.finished.connect(self._igsThread.deleteLater)
+            self._igsThread.start()
+        except Exception as e:
+            self._setIGSInputsEnabled(True)
+            self.log(f"Error while getting IGS data: {e}", level="error")
+            
+    def _onIGSDone(self, success: bool, message: str):
+        """Called on the GUI thread when the IGS download worker has finished."""
+        self._setIGSInputsEnabled(True)
+        if not success:
+            self.log(message, level="error")
+        elif self._lastDateKey != self._igsDateKey:
+            # should not happen (the calendar is disabled), but never accept data of another day
+            self.log("The observation date has changed during the download: download the IGS data again.", level="warning")
+        else:
+            self.log(message)
             # remove the yellow background color
-            self.log("IGS data downloaded successfully.")
             self.setCheck('igsData', True)
             
             # TODO: enable "Add Rover" button
             # self.btnAddRover.setEnabled(True)
-        except Exception as e:
-            self.log(f"Error while getting IGS data: {e}", level="error")
+            
+    def _setIGSInputsEnabled(self, enabled: bool):
+        """Enable or disable the widgets that change what the IGS downloader works on."""
+        self.btnDownloadIGSData.setEnabled(enabled)
+        self.calDateTime.setEnabled(enabled)
+        self.btnChooseDirectory.setEnabled(enabled)
             
     def addRover(self):
-        """Add a rover tab."""
+        """Open a dialog to choose the rover observation file, then add the rover (see _addRoverWithFile)."""
+        try:
+            # non-blocking dialog: the rover is added when a file is selected
+            self._openFileDialog("Select Rover OBS File", self._addRoverWithFile)
+        except Exception as e:
+            self.log(f"Error adding rover: {e}", level="error")
+            
+    def _addRoverWithFile(self, obsFile):
+        """Add a rover tab for the selected observation file."""
         try:
-            # open a dialog to choose the rover observation file
-            obsFile, _ = QtWidgets.QFileDialog.getOpenFileName(self.mainWindow, "Select Rover OBS File")
-            newRoverName = super().getController().getNewRoverName()
-            super().getController().addRover(newRoverName, obsFile)
+            newRoverName = self._controller.getNewRoverName()
+            self._controller.addRover(newRoverName, obsFile)
             # add the rover tab to the GUI
             self.tabsRover.addTab(Ui_RoverTab(obsFile=obsFile), newRoverName)
             self.tabsRover.setCurrentIndex(self.tabsRover.count() - 1)
@@ -189,26 +282,33 @@ class GUI(UserInterface):
             self.setCheck('thresholds', False)
             
             self.log(f"{newRoverName} added successfully.")
-            # remove the yellow background color
-            self.btnAddRover.setStyleSheet("")
         except Exception as e:
             self.log(f"Error adding rover: {e}", level="error")
             
     def deleteSelectedRover(self):
-        """Delete the selected rover tab."""
+        """Ask for confirmation, then delete the selected rover tab (see _completeDelete)."""
         try:
             currentIndex = self.tabsRover.currentIndex()
             roverName = self.tabsRover.tabText(currentIndex)
-            reply = QtWidgets.QMessageBox.question(
-                self.mainWindow,
-                "Confirm Deletion",
-                f"Are you sure you want to delete '{roverName}'?",
-                QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No
-            )
-            if reply != QtWidgets.QMessageBox.StandardButton.Yes:
+            # non-blocking dialog: the deletion continues when the dialog is closed
+            box = QtWidgets.QMessageBox(self.mainWindow)
+            box.setIcon(QtWidgets.QMessageBox.Icon.Question)
+            box.setWindowTitle("Confirm Deletion")
+            box.setText(f"Are you sure you want to delete '{roverName}'?")
+            box.setStandardButtons(QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No)
+            box.setAttribute(QtCore.Qt.WidgetAttribute.WA_DeleteOnClose)
+            box.finished.connect(lambda result, index=currentIndex, name=roverName: self._completeDelete(result, index, name))
+            box.open()
+        except Exception as e:
+            self.log(f"Error deleting rover: {e}", level="error")
+            
+    def _completeDelete(self, result, currentIndex, roverName):
+        """Delete the rover tab once the user has confirmed the deletion."""
+        try:
+            if result != QtWidgets.QMessageBox.StandardButton.Yes.value:
                 return
             if currentIndex != -1:
-                super().getController().deleteRover(roverName)
+                self._controller.deleteRover(roverName)
                 self.tabsRover.removeTab(currentIndex)
                 # disable the delete button if there are no more rovers
                 if self.tabsRover.count() == 0:
@@ -228,24 +328,39 @@ class GUI(UserInterface):
             self.log(f"Error deleting rover: {e}", level="error")
             
     def chooseBaseStationOBSFile(self):
-        """Open a dialog to choose the base station observation file."""
+        """Open a dialog to choose the base station observation file (see _setBaseStationOBSFile)."""
+        try:
+            # non-blocking dialog: the base station is set when a file is selected
+            self._openFileDialog("Select Base Station OBS File", self._setBaseStationOBSFile)
+        except Exception as e:
+            self.log(f"Error selecting base station observation file: {e}", level="error")
+            
+    def _setBaseStationOBSFile(self, obsFile):
+        """Set the selected base station observation file."""
         try:
-            # open a dialog to choose the base station observation file
-            obsFile, _ = QtWidgets.QFileDialog.getOpenFileName(self.mainWindow, "Select Base Station OBS File")
             if obsFile is not None and obsFile != "":
-                super().getController().setBaseStationOBS(obsFile)
+                self._controller.setBaseStationOBS(obsFile)
                 # update the base station .obs text field with the selected file
-                self.txtBaseStationOBS.setText(obsFile)
+                with QtCore.QSignalBlocker(self.txtBaseStationOBS):
+                    self.txtBaseStationOBS.setText(obsFile)
                 self.setCheck('baseStation', True)
                 self.log(f"Base Station observation file selected successfully.")
         except Exception as e:
             self.log(f"Error selecting base station observation file: {e}", level="error")
             
+    def _openFileDialog(self, title, onFileSelected):
+        """Open a non-blocking dialog to choose an existing file; onFileSelected is called with the chosen path."""
+        dialog = QtWidgets.QFileDialog(self.mainWindow, title)
+        dialog.setFileMode(QtWidgets.QFileDialog.FileMode.ExistingFile)
+        dialog.setAttribute(QtCore.Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.fileSelected.connect(onFileSelected)
+        dialog.open()
+        
     def setupThresholds(self):
         """
         Open a dialog to set the thresholds on the distances between rovers.
         """
-        self.thresholdWidget = Ui_ThresholdsPopup(super().getController(), self)
+        self.thresholdWidget = Ui_ThresholdsPopup(self._controller, self)
         self.thresholdWidget.show()
         self.setCheck('thresholds', True)
         
@@ -255,7 +370,7 @@ class GUI(UserInterface):
         """
         try:
             # set the threshold on the distance between two rovers
-            super().getController().setThreshold((rover1, rover2), value)
+            self._controller.setThreshold((rover1, rover2), value)
             nomeRover1 = str(rover1.name) if rover1 is not None else rover1
             nomeRover2 = str('-' + rover2.name) if rover2 is not None else ""
             self.log(f"Threshold for {nomeRover1}{nomeRover2} set to {value}.")
@@ -266,7 +381,7 @@ class GUI(UserInterface):
         """
         Open a dialog to set the distances between rovers.
         """
-        self.distancesWidget = Ui_DistancesPopup(super().getController(), self)
+        self.distancesWidget = Ui_DistancesPopup(self._controller, self)
         self.distancesWidget.show()
         self.setCheck('distances', True)
         
@@ -276,19 +391,22 @@ class GUI(UserInterface):
         """
         try:
             # set the distance between two rovers
-            super().getController().setDistance((rover1, rover2), value)
+            self._controller.setDistance((rover1, rover2), value)
             self.log(f"Distance between {rover1.name} and {rover2.name} set to {value}.")
         except Exception as e:
             self.log(f"Error setting distance: {e}", level="error")
     
     def run(self):
+        if self._running:
+            # a processing is already in progress
+            return
         try:
             # understand if there are any additional arguments to pass to the controller. In our case:
             additionalArgs = {}
             
             #   -ts   ds ts start day/time (ds=y/m/d ts=h:m:s) [obs start time]
             if self.chkStartingTime.isChecked():
-                startingDate = super().getController().getIGSDownloader().getDate()
+                startingDate = self._downloader.getDate()
                 startingTime = f"{self.txtStartingTime.text()}:00"
                 additionalArgs['-ts'] = f'{startingDate.year()}/{startingDate.month()}/{startingDate.day()} {startingTime}'
             
@@ -296,9 +414,9 @@ class GUI(UserInterface):
             if self.chkEndTime.isChecked():
                 if not self.chkStartingTime.isChecked():
                     raise Exception("Ending time requires a starting time to be set.")
-                startingDate = super().getController().getIGSDownloader().getDate()
+                startingDate = self._downloader.getDate()
                 startingTime = f"{self.txtStartingTime.text()}:00"
-                endingDate = super().getController().getIGSDownloader().getDate()
+                endingDate = self._downloader.getDate()
                 endingTime = f"{self.txtEndTime.text()}:00"
                 # Ensure ending time is greater than starting time
                 start_time_obj = QtCore.QTime.fromString(self.txtStartingTime.text(), "HH:mm")
@@ -315,14 +433,49 @@ class GUI(UserInterface):
                 else:
                     raise Exception("Time interval must be greater than 0.")
             
-            # run the processing
+            # run the processing in a worker thread, so the GUI stays responsive
             self.log("Processing started...")
-            super().getController().run(additionalArgs, self.log)
-            self.log("Processing completed successfully.")
-            # enable the plot button
-            self.btnPlotPositions.setEnabled(True)
+            # the controller is shared with the worker: nothing it works on can change until it has finished
+            self._setRunning(True)
+            self._runThread = QtCore.QThread(self.mainWindow)
+            self._runWorker = ProcessingWorker(self._controller, additionalArgs)
+            self._runWorker.moveToThread(self._runThread)
+            self._runThread.started.connect(self._runWorker.run)
+            self._runWorker.progress.connect(self.log)
+            self._runWorker.finished.connect(self._onRunDone)
+            self._runWorker.finished.connect(self._runThread.quit)
+            self._runWorker.finished.connect(self._runWorker.deleteLater)
+            self._runThread.finished.connect(self._runThread.deleteLater)
+            self._runThread.start()
         except Exception as e:
+            self._setRunning(False)
             self.log(f"Error during processing: {e}", level="error")
+            
+    def _onRunDone(self, success: bool, message: str):
+        """Called on the GUI thread when the processing worker has finished."""
+        self._setRunning(False)
+        if success:
+            self.log(message)
+            # enable the plot button
+            self.btnPlotPositions.setEnabled(True)
+        else:
+            self.log(message, level="error")
+    
+    def _setRunning(self, running: bool):
+        """Mark the processing as running (or finished), disabling (or restoring) the inputs it depends on."""
+        self._running = running
+        self.btnRUN.setEnabled(self._pendingChecks == 0 and not running)
+        self._setIGSInputsEnabled(not running)
+        self.btnAddRover.setEnabled(not running)
+        self.btnChooseBaseStationOBS.setEnabled(not running)
+        # delete, thresholds and distances follow the number of rovers, as in addRover
+        self.btnDeleteRover.setEnabled(not running and self.tabsRover.count() > 0)
+        self.btnSetupThresholds.setEnabled(not running and self.tabsRover.count() > 1)
+        self.btnSetupDistances.setEnabled(not running and self.tabsRover.count() > 1)
+        # the popups may still be open
+        for popup in (getattr(self, 'thresholdWidget', None), getattr(self, 'distancesWidget', None)):
+            if popup is not None:
+                popup.setEnabled(not running)
     
     def plotPositions(self):
         # TODO:
@@ -333,6 +486,17 @@ class GUI(UserInterface):
         Set the check status for a specific element.
         If value is True, the background color is removed; otherwise its background color is set.
         """
+        # Disable the plot button
+        self.btnPlotPositions.setEnabled(False)
+        
+        old = self._checks.get(checkType)
+        if old == value:
+            # nothing changed: no need to restyle the widgets
+            return
+        if old is None:
+            self._pendingChecks += 0 if value else 1
+        else:
+            self._pendingChecks += -1 if value else 1
         self._checks[checkType] = value
         
         widgets_map = {
@@ -345,377 +509,115 @@ class GUI(UserInterface):
         }
 
         if checkType in widgets_map:
-            widgets = widgets_map[checkType]
-            for widget in widgets:
-                widget.setStyleSheet("" if value else "background-color: lightyellow;")
-        
-        # Enable the RUN button if all checks are True
-        self.btnRUN.setEnabled(all(self._checks.values()))
-        # Disable the plot button
-        self.btnPlotPositions.setEnabled(False)
+            # the style comes from the window stylesheet, so only the property has to change
+            state = "ok" if value else "pending"
+            for widget in widgets_map[checkType]:
+                widget.setProperty("checkState", state)
+                widget.style().unpolish(widget)
+                widget.style().polish(widget)
+        
+        # Enable the RUN button if all checks are True (and the processing is not already running)
+        self.btnRUN.setEnabled(self._pendingChecks == 0 and not self._running)
     
     def log(self, message, level="info"):
         """Log messages to the status bar and the logger."""
-        if level == "info":
-            self.statusBar.setStyleSheet("QStatusBar { background-color: lightgray; }")
-            self.logger.info(message)
-        elif level == "warning":
-            self.statusBar.setStyleSheet("QStatusBar { background-color: yellow; }")
-            self.logger.warning(message)
-        elif level == "error":
-            self.statusBar.setStyleSheet("QStatusBar { background-color: red; }")
-            self.logger.error(message)
+        if level not in self._LOG_STYLES:
+            level = "info"
+        style = self._LOG_STYLES[level]
+        # setting the same stylesheet again would repolish the status bar for nothing
+        if self._currentLogStyle != style:
+            self.statusBar.setStyleSheet(style)
+            self._currentLogStyle = style
+        getattr(self.logger, level)(message)
         self.statusBar.showMessage(message)
-        sleep(2)
-        
-    # Form implementation generated from reading ui file 'GUI.ui'
-    #
-    # Created by: PyQt6 UI code generator 6.4.2
-    #
-    # WARNING: Any manual changes made to this file will be lost when pyuic6 is
-    # run again.  Do not edit this file unless you know what you are doing.
-    def setupUi(self, MainWindow):
-        MainWindow.setObjectName("MainWindow")
-        MainWindow.resize(595, 679)
-        self.centralwidget = QtWidgets.QWidget(parent=MainWindow)
-        self.centralwidget.setObjectName("centralwidget")
-        self.gridLayout = QtWidgets.QGridLayout(self.centralwidget)
-        self.gridLayout.setObjectName("gridLayout")
-        self.lblGeneralSettings = QtWidgets.QLabel(parent=self.centralwidget)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        font.setBold(True)
-        font.setWeight(75)
-        font.setStrikeOut(False)
-        self.lblGeneralSettings.setFont(font)
-        self.lblGeneralSettings.setObjectName("lblGeneralSettings")
-        self.gridLayout.addWidget(self.lblGeneralSettings, 0, 0, 1, 1)
-        self.hlyworkingDirectory = QtWidgets.QHBoxLayout()
-        self.hlyworkingDirectory.setObjectName("hlyworkingDirectory")
-        self.lblWorkingDirectory = QtWidgets.QLabel(parent=self.centralwidget)
-        self.lblWorkingDirectory.setObjectName("lblWorkingDirectory")
-        self.hlyworkingDirectory.addWidget(self.lblWorkingDirectory)
-        self.txtWorkingDirectory = QtWidgets.QLineEdit(parent=self.centralwidget)
-        self.txtWorkingDirectory.setObjectName("txtWorkingDirectory")
-        self.hlyworkingDirectory.addWidget(self.txtWorkingDirectory)
-        self.btnChooseDirectory = QtWidgets.QToolButton(parent=self.centralwidget)
-        self.btnChooseDirectory.setObjectName("btnChooseDirectory")
-        self.hlyworkingDirectory.addWidget(self.btnChooseDirectory)
-        self.gridLayout.addLayout(self.hlyworkingDirectory, 1, 0, 1, 1)
-        self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
-        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
-        self.calDateTime = QtWidgets.QCalendarWidget(parent=self.centralwidget)
-        self.calDateTime.setObjectName("calDateTime")
-        self.horizontalLayout_2.addWidget(self.calDateTime)
-        self.verticalLayout = QtWidgets.QVBoxLayout()
-        self.verticalLayout.setObjectName("verticalLayout")
-        self.formLayout = QtWidgets.QFormLayout()
-        self.formLayout.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignRight|QtCore.Qt.AlignmentFlag.AlignTrailing|QtCore.Qt.AlignmentFlag.AlignVCenter)
-        self.formLayout.setFormAlignment(QtCore.Qt.AlignmentFlag.AlignLeading|QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
-        self.formLayout.setObjectName("formLayout")
-        self.lblDate = QtWidgets.QLabel(parent=self.centralwidget)
-        self.lblDate.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight|QtCore.Qt.AlignmentFlag.AlignTrailing|QtCore.Qt.AlignmentFlag.AlignVCenter)
-        self.lblDate.setObjectName("lblDate")
-        self.formLayout.setWidget(0, QtWidgets.QFormLayout.ItemRole.LabelRole, self.lblDate)
-        self.lblSelectedDate = QtWidgets.QLabel(parent=self.centralwidget)
-        font = QtGui.QFont()
-        font.setBold(True)
-        font.setWeight(75)
-        self.lblSelectedDate.setFont(font)
-        self.lblSelectedDate.setObjectName("lblSelectedDate")
-        self.formLayout.setWidget(0, QtWidgets.QFormLayout.ItemRole.FieldRole, self.lblSelectedDate)
-        self.lbl4DigitYYYY = QtWidgets.QLabel(parent=self.centralwidget)
-        self.lbl4DigitYYYY.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight|QtCore.Qt.AlignmentFlag.AlignTrailing|QtCore.Qt.AlignmentFlag.AlignVCenter)
-        self.lbl4DigitYYYY.setObjectName("lbl4DigitYYYY")
-        self.formLayout.setWidget(1, QtWidgets.QFormLayout.ItemRole.LabelRole, self.lbl4DigitYYYY)
-        self.lblYYYY = QtWidgets.QLabel(parent=self.centralwidget)
-        font = QtGui.QFont()
-        font.setBold(True)
-        font.setWeight(75)
-        self.lblYYYY.setFont(font)
-        self.lblYYYY.setObjectName("lblYYYY")
-        self.formLayout.setWidget(1, QtWidgets.QFormLayout.ItemRole.FieldRole, self.lblYYYY)
-        self.lbl2DigitYY = QtWidgets.QLabel(parent=self.centralwidget)
-        self.lbl2DigitYY.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight|QtCore.Qt.AlignmentFlag.AlignTrailing|QtCore.Qt.AlignmentFlag.AlignVCenter)
-        self.lbl2DigitYY.setObjectName("lbl2DigitYY")
-        self.formLayout.setWidget(2, QtWidgets.QFormLayout.ItemRole.LabelRole, self.lbl2DigitYY)
-        self.lblYY = QtWidgets.QLabel(parent=self.centralwidget)
-        font = QtGui.QFont()
-        font.setBold(True)
-        font.setWeight(75)
-        self.lblYY.setFont(font)
-        self.lblYY.setObjectName("lblYY")
-        self.formLayout.setWidget(2, QtWidgets.QFormLayout.ItemRole.FieldRole, self.lblYY)
-        self.lbl4DigitWWWW = QtWidgets.QLabel(parent=self.centralwidget)
-        self.lbl4DigitWWWW.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight|QtCore.Qt.AlignmentFlag.AlignTrailing|QtCore.Qt.AlignmentFlag.AlignVCenter)
-        self.lbl4DigitWWWW.setObjectName("lbl4DigitWWWW")
-        self.formLayout.setWidget(3, QtWidgets.QFormLayout.ItemRole.LabelRole, self.lbl4DigitWWWW)
-        self.lblWWWW = QtWidgets.QLabel(parent=self.centralwidget)
-        font = QtGui.QFont()
-        font.setBold(True)
-        font.setWeight(75)
-        self.lblWWWW.setFont(font)
-        self.lblWWWW.setObjectName("lblWWWW")
-        self.formLayout.setWidget(3, QtWidgets.QFormLayout.ItemRole.FieldRole, self.lblWWWW)
-        self.lbl3DigitDDD = QtWidgets.QLabel(parent=self.centralwidget)
-        self.lbl3DigitDDD.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight|QtCore.Qt.AlignmentFlag.AlignTrailing|QtCore.Qt.AlignmentFlag.AlignVCenter)
-        self.lbl3DigitDDD.setObjectName("lbl3DigitDDD")
-        self.formLayout.setWidget(4, QtWidgets.QFormLayout.ItemRole.LabelRole, self.lbl3DigitDDD)
-        self.lblDDD = QtWidgets.QLabel(parent=self.centralwidget)
-        font = QtGui.QFont()
-        font.setBold(True)
-        font.setWeight(75)
-        self.lblDDD.setFont(font)
-        self.lblDDD.setObjectName("lblDDD")
-        self.formLayout.setWidget(4, QtWidgets.QFormLayout.ItemRole.FieldRole, self.lblDDD)
-        self.lbl1DigitD = QtWidgets.QLabel(parent=self.centralwidget)
-        self.lbl1DigitD.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight|QtCore.Qt.AlignmentFlag.AlignTrailing|QtCore.Qt.AlignmentFlag.AlignVCenter)
-        self.lbl1DigitD.setObjectName("lbl1DigitD")
-        self.formLayout.setWidget(5, QtWidgets.QFormLayout.ItemRole.LabelRole, self.lbl1DigitD)
-        self.lblD = QtWidgets.QLabel(parent=self.centralwidget)
-        font = QtGui.QFont()
-        font.setBold(True)
-        font.setWeight(75)
-        self.lblD.setFont(font)
-        self.lblD.setObjectName("lblD")
-        self.formLayout.setWidget(5, QtWidgets.QFormLayout.ItemRole.FieldRole, self.lblD)
-        self.verticalLayout.addLayout(self.formLayout)
-        self.hlyStartTime = QtWidgets.QHBoxLayout()
-        self.hlyStartTime.setObjectName("hlyStartTime")
-        self.chkStartingTime = QtWidgets.QCheckBox(parent=self.centralwidget)
-        self.chkStartingTime.setObjectName("chkStartingTime")
-        self.hlyStartTime.addWidget(self.chkStartingTime)
-        self.txtStartingTime = QtWidgets.QTimeEdit(parent=self.centralwidget)
-        self.txtStartingTime.setObjectName("txtStartingTime")
-        self.hlyStartTime.addWidget(self.txtStartingTime)
-        self.verticalLayout.addLayout(self.hlyStartTime)
-        self.hlyEndTime = QtWidgets.QHBoxLayout()
-        self.hlyEndTime.setObjectName("hlyEndTime")
-        self.chkEndTime = QtWidgets.QCheckBox(parent=self.centralwidget)
-        self.chkEndTime.setObjectName("chkEndTime")
-        self.hlyEndTime.addWidget(self.chkEndTime)
-        self.txtEndTime = QtWidgets.QTimeEdit(parent=self.centralwidget)
-        self.txtEndTime.setObjectName("txtEndTime")
-        self.hlyEndTime.addWidget(self.txtEndTime)
-        self.verticalLayout.addLayout(self.hlyEndTime)
-        self.hlyTimeInterval = QtWidgets.QHBoxLayout()
-        self.hlyTimeInterval.setObjectName("hlyTimeInterval")
-        self.chkTimeInterval = QtWidgets.QCheckBox(parent=self.centralwidget)
-        self.chkTimeInterval.setObjectName("chkTimeInterval")
-        self.hlyTimeInterval.addWidget(self.chkTimeInterval)
-        self.cmbTimeInterval = QtWidgets.QComboBox(parent=self.centralwidget)
-        self.cmbTimeInterval.setObjectName("cmbTimeInterval")
-        self.hlyTimeInterval.addWidget(self.cmbTimeInterval)
-        self.verticalLayout.addLayout(self.hlyTimeInterval)
-        self.horizontalLayout_2.addLayout(self.verticalLayout)
-        self.gridLayout.addLayout(self.horizontalLayout_2, 2, 0, 1, 1)
-        self.hlyIGSProvider = QtWidgets.QHBoxLayout()
-        self.hlyIGSProvider.setObjectName("hlyIGSProvider")
-        self.lblIGSDataProvider = QtWidgets.QLabel(parent=self.centralwidget)
-        self.lblIGSDataProvider.setObjectName("lblIGSDataProvider")
-        self.hlyIGSProvider.addWidget(self.lblIGSDataProvider)
-        self.cmbIGSDataProvider = QtWidgets.QComboBox(parent=self.centralwidget)
-        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Fixed)
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.cmbIGSDataProvider.sizePolicy().hasHeightForWidth())
-        self.cmbIGSDataProvider.setSizePolicy(sizePolicy)
-        self.cmbIGSDataProvider.setObjectName("cmbIGSDataProvider")
-        self.hlyIGSProvider.addWidget(self.cmbIGSDataProvider)
-        self.btnDownloadIGSData = QtWidgets.QPushButton(parent=self.centralwidget)
-        self.btnDownloadIGSData.setObjectName("btnDownloadIGSData")
-        self.hlyIGSProvider.addWidget(self.btnDownloadIGSData)
-        self.gridLayout.addLayout(self.hlyIGSProvider, 3, 0, 1, 1)
-        self.line = QtWidgets.QFrame(parent=self.centralwidget)
-        self.line.setFrameShape(QtWidgets.QFrame.Shape.HLine)
-        self.line.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
-        self.line.setObjectName("line")
-        self.gridLayout.addWidget(self.line, 4, 0, 1, 1)
-        self.vlyRoversBase = QtWidgets.QVBoxLayout()
-        self.vlyRoversBase.setObjectName("vlyRoversBase")
-        self.vlyRovers = QtWidgets.QVBoxLayout()
-        self.vlyRovers.setObjectName("vlyRovers")
-        self.lblRovers = QtWidgets.QLabel(parent=self.centralwidget)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        font.setBold(True)
-        font.setWeight(75)
-        self.lblRovers.setFont(font)
-        self.lblRovers.setObjectName("lblRovers")
-        self.vlyRovers.addWidget(self.lblRovers)
-        self.hlyRoverButtons = QtWidgets.QHBoxLayout()
-        self.hlyRoverButtons.setObjectName("hlyRoverButtons")
-        self.btnSetupThresholds = QtWidgets.QPushButton(parent=self.centralwidget)
-        self.btnSetupThresholds.setObjectName("btnSetupThresholds")
-        self.hlyRoverButtons.addWidget(self.btnSetupThresholds)
-        self.btnSetupDistances = QtWidgets.QPushButton(parent=self.centralwidget)
-        self.btnSetupDistances.setObjectName("btnSetupDistances")
-        self.hlyRoverButtons.addWidget(self.btnSetupDistances)
-        self.btnAddRover = QtWidgets.QPushButton(parent=self.centralwidget)
-        self.btnAddRover.setObjectName("btnAddRover")
-        self.hlyRoverButtons.addWidget(self.btnAddRover)
-        self.btnDeleteRover = QtWidgets.QPushButton(parent=self.centralwidget)
-        self.btnDeleteRover.setEnabled(False)
-        self.btnDeleteRover.setObjectName("btnDeleteRover")
-        self.hlyRoverButtons.addWidget(self.btnDeleteRover)
-        self.vlyRovers.addLayout(self.hlyRoverButtons)
-        self.tabsRover = QtWidgets.QTabWidget(parent=self.centralwidget)
-        self.tabsRover.setObjectName("tabsRover")
-        self.tab = QtWidgets.QWidget()
-        self.tab.setObjectName("tab")
-        self.tabsRover.addTab(self.tab, "")
-        self.tab_2 = QtWidgets.QWidget()
-        self.tab_2.setObjectName("tab_2")
-        self.tabsRover.addTab(self.tab_2, "")
-        self.vlyRovers.addWidget(self.tabsRover)
-        self.vlyRoversBase.addLayout(self.vlyRovers)
-        self.vlyBaseStation = QtWidgets.QVBoxLayout()
-        self.vlyBaseStation.setObjectName("vlyBaseStation")
-        self.lblBaseStation = QtWidgets.QLabel(parent=self.centralwidget)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        font.setBold(True)
-        font.setWeight(75)
-        self.lblBaseStation.setFont(font)
-        self.lblBaseStation.setObjectName("lblBaseStation")
-        self.vlyBaseStation.addWidget(self.lblBaseStation)
-        self.hlyOBSFileName = QtWidgets.QHBoxLayout()
-        self.hlyOBSFileName.setObjectName("hlyOBSFileName")
-        self.lblBaseStationOBS = QtWidgets.QLabel(parent=self.centralwidget)
-        self.lblBaseStationOBS.setObjectName("lblBaseStationOBS")
-        self.hlyOBSFileName.addWidget(self.lblBaseStationOBS)
-        self.txtBaseStationOBS = QtWidgets.QLineEdit(parent=self.centralwidget)
-        self.txtBaseStationOBS.setObjectName("txtBaseStationOBS")
-        self.hlyOBSFileName.addWidget(self.txtBaseStationOBS)
-        self.btnChooseBaseStationOBS = QtWidgets.QToolButton(parent=self.centralwidget)
-        self.btnChooseBaseStationOBS.setObjectName("btnChooseBaseStationOBS")
-        self.hlyOBSFileName.addWidget(self.btnChooseBaseStationOBS)
-        self.vlyBaseStation.addLayout(self.hlyOBSFileName)
-        self.vlyRoversBase.addLayout(self.vlyBaseStation)
-        self.gridLayout.addLayout(self.vlyRoversBase, 5, 0, 1, 1)
-        self.line_3 = QtWidgets.QFrame(parent=self.centralwidget)
-        self.line_3.setFrameShape(QtWidgets.QFrame.Shape.HLine)
-        self.line_3.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
-        self.line_3.setObjectName("line_3")
-        self.gridLayout.addWidget(self.line_3, 6, 0, 1, 1)
-        self.hlyButtons = QtWidgets.QHBoxLayout()
-        self.hlyButtons.setObjectName("hlyButtons")
-        self.btnRUN = QtWidgets.QPushButton(parent=self.centralwidget)
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        font.setBold(False)
-        font.setWeight(50)
-        font.setKerning(False)
-        self.btnRUN.setFont(font)
-        self.btnRUN.setObjectName("btnRUN")
-        self.hlyButtons.addWidget(self.btnRUN)
-        self.btnPlotPositions = QtWidgets.QPushButton(parent=self.centralwidget)
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        self.btnPlotPositions.setFont(font)
-        self.btnPlotPositions.setObjectName("btnPlotPositions")
-        self.hlyButtons.addWidget(self.btnPlotPositions)
-        self.gridLayout.addLayout(self.hlyButtons, 7, 0, 1, 1)
-        MainWindow.setCentralWidget(self.centralwidget)
-        self.menubar = QtWidgets.QMenuBar(parent=MainWindow)
-        self.menubar.setGeometry(QtCore.QRect(0, 0, 595, 22))
-        self.menubar.setObjectName("menubar")
-        MainWindow.setMenuBar(self.menubar)
-        self.statusbar = QtWidgets.QStatusBar(parent=MainWindow)
-        self.statusbar.setObjectName("statusbar")
-        MainWindow.setStatusBar(self.statusbar)
-        MainWindow.setWindowIcon(QtGui.QIcon(os.path.join(os.path.dirname(__file__), '..', '..', "logo.png")))
-
-        self.retranslateUi(MainWindow)
-        self.tabsRover.setCurrentIndex(1)
-        QtCore.QMetaObject.connectSlotsByName(MainWindow)
-
-    def retranslateUi(self, MainWindow):
-        _translate = QtCore.QCoreApplication.translate
-        MainWindow.setWindowTitle(_translate("MainWindow", "GNSSPos"))
-        self.lblGeneralSettings.setText(_translate("MainWindow", "General Settings"))
-        self.lblWorkingDirectory.setText(_translate("MainWindow", "Working Directory:"))
-        self.txtWorkingDirectory.setPlaceholderText(_translate("MainWindow", "press the button aside to choose the working directory..."))
-        self.btnChooseDirectory.setText(_translate("MainWindow", "..."))
-        self.lblDate.setText(_translate("MainWindow", "Selected Date:"))
-        self.lblSelectedDate.setText(_translate("MainWindow", "dd/mm/yyyy"))
-        self.lbl4DigitYYYY.setText(_translate("MainWindow", "4-digit year (YYYY):"))
-        self.lblYYYY.setText(_translate("MainWindow", "YYYY"))
-        self.lbl2DigitYY.setText(_translate("MainWindow", "2-digit year (YY):"))
-        self.lblYY.setText(_translate("MainWindow", "YY"))
-        self.lbl4DigitWWWW.setText(_translate("MainWindow", "4-digit GPS week (WWWW):"))
-        self.lblWWWW.setText(_translate("MainWindow", "WWWW"))
-        self.lbl3DigitDDD.setText(_translate("MainWindow", "3-digit day of year (DDD):"))
-        self.lblDDD.setText(_translate("MainWindow", "DDD"))
-        self.lbl1DigitD.setText(_translate("MainWindow", "1-digit day of week (D):"))
-        self.lblD.setText(_translate("MainWindow", "D"))
-        self.chkStartingTime.setText(_translate("MainWindow", "Starting Time:"))
-        self.chkEndTime.setText(_translate("MainWindow", "End Time:"))
-        self.chkTimeInterval.setText(_translate("MainWindow", "Time Interval:"))
-        self.lblIGSDataProvider.setText(_translate("MainWindow", "IGS Data Provider:"))
-        self.btnDownloadIGSData.setText(_translate("MainWindow", "Download Data"))
-        self.lblRovers.setText(_translate("MainWindow", "Rovers"))
-        self.btnSetupThresholds.setText(_translate("MainWindow", "Setup Thresholds"))
-        self.btnSetupDistances.setText(_translate("MainWindow", "Setup Distances"))
-        self.btnAddRover.setText(_translate("MainWindow", "Add Rover"))
-        self.btnDeleteRover.setText(_translate("MainWindow", "Delete Selected Rover"))
-        self.tabsRover.setTabText(self.tabsRover.indexOf(self.tab), _translate("MainWindow", "Tab 1"))
-        self.tabsRover.setTabText(self.tabsRover.indexOf(self.tab_2), _translate("MainWindow", "Tab 2"))
-        self.lblBaseStation.setText(_translate("MainWindow", "Base Station"))
-        self.lblBaseStationOBS.setText(_translate("MainWindow", "OBS File:"))
-        self.txtBaseStationOBS.setPlaceholderText(_translate("MainWindow", "press the button aside to choose an .OBS file..."))
-        self.btnChooseBaseStationOBS.setText(_translate("MainWindow", "..."))
-        self.btnRUN.setText(_translate("MainWindow", "RUN"))
-        self.btnPlotPositions.setText(_translate("MainWindow", "PLOT SOLUTIONS"))
-    ### --- END OF GENERATED CODE ---
+        # keep the message visible for 2 seconds without blocking the event loop
+        self._statusTimer.start()
+        
+    def _clearStatus(self):
+        """Clear the status bar message and restore its style."""
+        self.statusBar.setStyleSheet("")
+        self._currentLogStyle = ""
+        self.statusBar.clearMessage()
+        
+class IGSDownloadWorker(QtCore.QObject):
+    """
+    Worker that downloads the IGS data outside the GUI thread.
+    It must be moved to a QThread; progress and result are reported through signals.
+    """
     
-# Form implementation generated from reading ui file 'RoverTab.ui'
-#
-# Created by: PyQt6 UI code generator 6.4.2
-#
-# WARNING: Any manual changes made to this file will be lost when pyuic6 is
-# run again.  Do not edit this file unless you know what you are doing.
-class Ui_RoverTab(QtWidgets.QWidget):
-    # TODO: everytime you modify this .ui, remember to replace the inherited class (object -> QWidget).
+    progress = QtCore.pyqtSignal(str, str)
+    """Emitted after every downloaded product, with the message and the log level."""
     
-    def setupUi(self, RoverTab):
-        RoverTab.setObjectName("RoverTab")
-        RoverTab.resize(404, 43)
-        self.gridLayout = QtWidgets.QGridLayout(RoverTab)
-        self.gridLayout.setObjectName("gridLayout")
-        self.lblChooseRoverOBS = QtWidgets.QLabel(parent=RoverTab)
-        self.lblChooseRoverOBS.setObjectName("lblChooseRoverOBS")
-        self.gridLayout.addWidget(self.lblChooseRoverOBS, 0, 0, 1, 1)
-        self.txtRoverOBSFile = QtWidgets.QLineEdit(parent=RoverTab)
-        self.txtRoverOBSFile.setObjectName("txtRoverOBSFile")
-        self.gridLayout.addWidget(self.txtRoverOBSFile, 0, 1, 1, 1)
-        self.btnChooseRoverOBS = QtWidgets.QToolButton(parent=RoverTab)
-        self.btnChooseRoverOBS.setObjectName("btnChooseRoverOBS")
-        self.gridLayout.addWidget(self.btnChooseRoverOBS, 0, 2, 1, 1)
-
-        self.retranslateUi(RoverTab)
-        QtCore.QMetaObject.connectSlotsByName(RoverTab)
-
-    def retranslateUi(self, RoverTab):
-        _translate = QtCore.QCoreApplication.translate
-        RoverTab.setWindowTitle(_translate("RoverTab", "Form"))
-        self.lblChooseRoverOBS.setText(_translate("RoverTab", "OBS File:"))
-        self.txtRoverOBSFile.setPlaceholderText(_translate("RoverTab", "press the button aside to choose an .OBS file..."))
-        self.btnChooseRoverOBS.setText(_translate("RoverTab", "..."))
-    # --- END OF GENERATED CODE ---
+    finished = QtCore.pyqtSignal(bool, str)
+    """Emitted at the end, with the outcome and a final message."""
     
-    def __init__(self, obsFile: str = None):
-        """Initialize the RoverTab UI."""
+    def __init__(self, downloader, workdir: str):
+        """Initialize the worker with the IGS downloader and the working directory."""
         super().__init__()
-        self.setupUi(self)
+        self._downloader = downloader
+        self._workdir = workdir
         
-        # Set the default OBS file path if provided
-        if obsFile is not None:
-            self.txtRoverOBSFile.setText(obsFile)
-        self.txtRoverOBSFile.setReadOnly(True)
+    @QtCore.pyqtSlot()
+    def run(self):
+        """Download all the IGS products concurrently, reporting each one as soon as it is ready."""
+        try:
+            self._downloader.downloadAll(self._workdir, lambda product: self.progress.emit(f"{product} downloaded successfully.", "info"))
+            self.finished.emit(True, "IGS data downloaded successfully.")
+        except Exception as e:
+            self.finished.emit(False, f"Error while getting IGS data: {e}")
         
-        # Connect signals to slots (add event handlers)
-        self.btnChooseRoverOBS.clicked.connect(self.chooseRoverOBSFile)
+class ProcessingWorker(QtCore.QObject):
+    """
+    Worker that runs the GNSSPos processing outside the GUI thread.
+    It must be moved to a QThread; progress and result are reported through signals.
+    """
+    
+    progress = QtCore.pyqtSignal(str, str)
+    """Emitted for every message logged by the processing, with the message and the log level."""
+    
+    finished = QtCore.pyqtSignal(bool, str)
+    """Emitted at the end, with the outcome and a final message."""
+    
+    def __init__(self, controller, additionalArgs: dict):
+        """Initialize the worker with the GNSSPos controller and the additional RTKPOST arguments."""
+        super().__init__()
+        self._controller = controller
+        self._additionalArgs = additionalArgs
+        
+    @QtCore.pyqtSlot()
+    def run(self):
+        """Run the processing, forwarding its log messages to the GUI thread."""
+        try:
+            self._controller.run(self._additionalArgs, lambda message: self.progress.emit(message, "info"))
+            self.finished.emit(True, "Processing completed successfully.")
+        except Exception as e:
+            self.finished.emit(False, f"Error during processing: {e}")
+        
+class Ui_RoverTab(QtWidgets.QWidget, _generated_ui.Ui_RoverTab):
+    """
+    Tab of a single rover: the widgets come from the generated Ui_RoverTab form.
+    """
+    
+    def __init__(self, obsFile: str = None):
+        """Initialize the RoverTab UI; the widgets are built the first time the tab is shown."""
+        super().__init__()
+        self._obsFile = obsFile
+        self._built = False
+        
+    def showEvent(self, event):
+        """Build the widgets of the tab on its first show."""
+        if not self._built:
+            self.setupUi(self)
+            
+            # Set the default OBS file path if provided
+            if self._obsFile is not None:
+                self.txtRoverOBSFile.setText(self._obsFile)
+            self.txtRoverOBSFile.setReadOnly(True)
+            
+            # Connect signals to slots (add event handlers)
+            self.btnChooseRoverOBS.clicked.connect(self.chooseRoverOBSFile)
+            self._built = True
+        super().showEvent(event)
         
     def chooseRoverOBSFile(self):
         """Open a dialog to choose the rover observation file."""
@@ -726,6 +628,25 @@ class Ui_RoverTab(QtWidgets.QWidget):
         except Exception as e:
             raise Exception(f"Error selecting rover .obs file: {e}")
         
+_DOUBLE_VALIDATOR = None
+"""Validator shared by the numeric fields of the popups, created on first use."""
+
+def _doubleValidator():
+    """Return the validator of the popup fields: non-negative values in meters, with 2 decimals and '.' as separator."""
+    global _DOUBLE_VALIDATOR
+    if _DOUBLE_VALIDATOR is None:
+        _DOUBLE_VALIDATOR = QtGui.QDoubleValidator(0.0, 99.99, 2)
+        _DOUBLE_VALIDATOR.setNotation(QtGui.QDoubleValidator.Notation.StandardNotation)
+        _DOUBLE_VALIDATOR.setLocale(QtCore.QLocale.c())
+    return _DOUBLE_VALIDATOR
+
+def _commitValue(setter, key1, key2, textBox):
+    """Pass the value of a popup field to its setter, when the user has finished editing it."""
+    # editingFinished is emitted also when the field just loses focus
+    if textBox.isModified():
+        textBox.setModified(False)
+        setter(key1, key2, float(textBox.text()))
+    
 class Ui_ThresholdsPopup(QtWidgets.QWidget):
     """
     This class is used to create a popup window for setting thresholds.
@@ -740,44 +661,39 @@ class Ui_ThresholdsPopup(QtWidgets.QWidget):
         thresholds = controller.getThresholds()
         rovers = controller.getRovers()
         
-        verticalLayout = QtWidgets.QVBoxLayout()
-        
-        for kRow, vRow in enumerate(rovers):
-            for kCol, vCol in enumerate(rovers):
-                if kRow < kCol:
-                    # Creo layout orizzontale
-                    horizontalLayout = QtWidgets.QHBoxLayout()
-                    # Creo etichetta e casella di testo
-                    label = QtWidgets.QLabel(f"{vRow.name} - {vCol.name}: ")
-                    horizontalLayout.addWidget(label)
-                    # Creo casella di testo per input numerico
-                    textBox = QtWidgets.QDoubleSpinBox()
-                    textBox.setObjectName(f"threshold_{vRow.name}_{vCol.name}")
-                    textBox.setValue(float(thresholds.get((vRow, vCol), 0.00)))
-                    textBox.valueChanged.connect(lambda value: parentWidget.setThreshold(vRow, vCol, value))
-                    horizontalLayout.addWidget(textBox)
-                    verticalLayout.addLayout(horizontalLayout)
+        # nessun repaint durante la costruzione del form
+        self.setUpdatesEnabled(False)
+        # una riga (etichetta + casella) per ogni valore, in un unico form layout
+        formLayout = QtWidgets.QFormLayout()
+        LineEdit = QtWidgets.QLineEdit
+        
+        # una riga per ogni coppia di rover
+        for vRow, vCol in combinations(rovers, 2):
+            # Creo casella di testo per input numerico, letta solo a fine modifica
+            textBox = LineEdit()
+            textBox.setValidator(_doubleValidator())
+            textBox.setObjectName(f"threshold_{vRow.name}_{vCol.name}")
+            textBox.setText(f"{float(thresholds.get((vRow, vCol), 0.00)):.2f}")
+            textBox.editingFinished.connect(partial(_commitValue, parentWidget.setThreshold, vRow, vCol, textBox))
+            formLayout.addRow(f"{vRow.name} - {vCol.name}: ", textBox)
         # ho anche le threshold su sdx, sdy, sdz
         for vSd in ['sdx', 'sdy', 'sdz']:
-            # Creo layout orizzontale
-            horizontalLayout = QtWidgets.QHBoxLayout()
-            # Creo etichetta e casella di testo
-            label = QtWidgets.QLabel(f"{vSd}: ")
-            horizontalLayout.addWidget(label)
-            # Creo casella di testo per input numerico
-            textBox = QtWidgets.QDoubleSpinBox()
+            # Creo casella di testo per input numerico, letta solo a fine modifica
+            textBox = LineEdit()
+            textBox.setValidator(_doubleValidator())
             textBox.setObjectName(f"threshold_{vSd}")
-            textBox.setValue(float(thresholds.get((vSd, None), 0.00)))
-            textBox.valueChanged.connect(lambda value: parentWidget.setThreshold(vSd, None, value))
-            horizontalLayout.addWidget(textBox)
-            verticalLayout.addLayout(horizontalLayout)
+            textBox.setText(f"{float(thresholds.get((vSd, None), 0.00)):.2f}")
+            textBox.editingFinished.connect(partial(_commitValue, parentWidget.setThreshold, vSd, None, textBox))
+            formLayout.addRow(f"{vSd}: ", textBox)
         # aggiungo un pulsante per chiudere il form
         # button = QtWidgets.QPushButton("Close")
         # button.clicked.connect(popupWidget.close)
-        # verticalLayout.addWidget(button)
+        # formLayout.addRow(button)
         # imposto il layout principale della finestra
-        self.setLayout(verticalLayout)
+        self.setLayout(formLayout)
+        self.setUpdatesEnabled(True)
         self.setWindowTitle("Thresholds (in meters)")
+        self.setWindowIcon(_generated_ui.logo_icon())
         
 class Ui_DistancesPopup(QtWidgets.QWidget):
     """
@@ -792,27 +708,27 @@ class Ui_DistancesPopup(QtWidgets.QWidget):
         distances = controller.getDistances()
         rovers = controller.getRovers()
         
-        verticalLayout = QtWidgets.QVBoxLayout()
-        
-        for kRow, vRow in enumerate(rovers):
-            for kCol, vCol in enumerate(rovers):
-                if kRow < kCol:
-                    # Creo layout orizzontale
-                    horizontalLayout = QtWidgets.QHBoxLayout()
-                    # Creo etichetta e casella di testo
-                    label = QtWidgets.QLabel(f"{vRow.name} - {vCol.name}: ")
-                    horizontalLayout.addWidget(label)
-                    # Creo casella di testo per input numerico
-                    textBox = QtWidgets.QDoubleSpinBox()
-                    textBox.setObjectName(f"distance_{vRow.name}_{vCol.name}")
-                    textBox.setValue(float(distances.get((vRow, vCol), 0.00)))
-                    textBox.valueChanged.connect(lambda value: parentWidget.setDistance(vRow, vCol, value))
-                    horizontalLayout.addWidget(textBox)
-                    verticalLayout.addLayout(horizontalLayout)
+        # nessun repaint durante la costruzione del form
+        self.setUpdatesEnabled(False)
+        # una riga (etichetta + casella) per ogni valore, in un unico form layout
+        formLayout = QtWidgets.QFormLayout()
+        LineEdit = QtWidgets.QLineEdit
+        
+        # una riga per ogni coppia di rover
+        for vRow, vCol in combinations(rovers, 2):
+            # Creo casella di testo per input numerico, letta solo a fine modifica
+            textBox = LineEdit()
+            textBox.setValidator(_doubleValidator())
+            textBox.setObjectName(f"distance_{vRow.name}_{vCol.name}")
+            textBox.setText(f"{float(distances.get((vRow, vCol), 0.00)):.2f}")
+            textBox.editingFinished.connect(partial(_commitValue, parentWidget.setDistance, vRow, vCol, textBox))
+            formLayout.addRow(f"{vRow.name} - {vCol.name}: ", textBox)
         # aggiungo un pulsante per chiudere il form
         # button = QtWidgets.QPushButton("Close")
         # button.clicked.connect(popupWidget.close)
-        # verticalLayout.addWidget(button)
+        # formLayout.addRow(button)
         # imposto il layout principale della finestra
-        self.setLayout(verticalLayout)
-        self.setWindowTitle("Distances (in meters)")
\ No newline at end of file
+        self.setLayout(formLayout)
+        self.setUpdatesEnabled(True)
+        self.setWindowTitle("Distances (in meters)")
+        self.setWindowIcon(_generated_ui.logo_icon())
\ No newline at end of file
@@ -8,6 +8,8 @@ class UserInterface(ABC):
     Subclasses should implement these methods to provide specific user interface functionality.
     """
     
+    __slots__ = ("_gnsspos",)
+    
     _gnsspos: any
     """The GNSSPos instance associated with this user interface."""
     
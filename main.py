@@ -1,20 +1,16 @@
 import argparse
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-from dotenv import load_dotenv
+from dotenv import find_dotenv, load_dotenv
 
 from gnsspos.gnsspos import GNSSPos
-from gnsspos.ui.cli import CLI
-from gnsspos.ui.gui import GUI
-from PyQt6.QtWidgets import QApplication, QMainWindow
 
 def main():
     PROGRAM_NAME = "GNSSPos"
     PROGRAM_VERSION = "1.5.0"
     welcome_message = f"""Welcome to {PROGRAM_NAME}! This program processes GNSS data, enabling kinematic precise point positioning (PPP) by post-processing .obs RINEX files from multiple receivers simultaneously, integrating them with a base station."""
-    
-    load_dotenv()
 
     # argparse is needed to understand if the program should run in CLI or GUI mode
     parser = argparse.ArgumentParser(
@@ -39,6 +35,11 @@ def main():
     # Parse command line arguments checking for required arguments if not in GUI mode
     args = parser.parse_args()
     
+    # loaded only now: --help and --version have already exited
+    env = find_dotenv()
+    if env:
+        load_dotenv(env)
+    
     # Set up logging configuration
     logging.basicConfig(level=args.loglevel, format='%(asctime)s [%(levelname)s]: %(message)s')
     
@@ -50,20 +51,28 @@ def main():
     #         sys.exit(1)
     
     try:
-        # Set up GNSSPos instance
-        gnsspos = GNSSPos(
-            workdir=args.workdir,
-            rovers=args.rovers,
-            base=args.base
-        )
-        
         if args.gui:
             logging.info(f"{PROGRAM_NAME} starting in GUI mode...")
-            app = QApplication([])
-            mainWindow = QMainWindow()
+            # Set up GNSSPos instance in a worker thread (it does no Qt calls),
+            # while the main thread loads PyQt6 and creates the application and the window
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(GNSSPos, workdir=args.workdir, rovers=args.rovers, base=args.base)
+                # PyQt6 is imported only when it is actually needed
+                from PyQt6.QtWidgets import QApplication, QMainWindow
+                from gnsspos.ui.gui import GUI
+                app = QApplication.instance() or QApplication(sys.argv)
+                mainWindow = QMainWindow()
+                gnsspos = future.result()
             ui = GUI(gnsspos, logging, mainWindow)
         else:
             logging.info(f"{PROGRAM_NAME} starting in CLI mode...")
+            from gnsspos.ui.cli import CLI
+            # Set up GNSSPos instance
+            gnsspos = GNSSPos(
+                workdir=args.workdir,
+                rovers=args.rovers,
+                base=args.base
+            )
             ui = CLI(gnsspos, logging)
             
         # link the UI to the GNSSPos instance
@@ -75,8 +84,8 @@ def main():
         if args.gui:
             sys.exit(app.exec())
     except Exception as e:
-        e.with_traceback()
-        logging.error(f"An error occurred: {e}")
+        # logs the message together with the traceback of the exception
+        logging.exception(f"An error occurred: {e}")
         sys.exit(1)
     
 